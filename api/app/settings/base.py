@@ -24,6 +24,9 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': datetime.timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': datetime.timedelta(days=1),
+    # Tokens carry the user claims the views need (see pft/authentication.py)
+    'TOKEN_OBTAIN_SERIALIZER': 'pft.authentication.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'pft.authentication.ClaimsTokenRefreshSerializer',
 }
 
 # Application definition
@@ -35,6 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     'pft',
     'django_extensions',
     'rest_framework',
@@ -47,7 +51,7 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'pft.authentication.ClaimsJWTAuthentication',
     ),
 }
 
@@ -62,6 +66,8 @@ SPECTACULAR_SETTINGS = {
 }
 
 MIDDLEWARE = [
+    # First, so that it measures everything below it
+    "pft.middleware.RequestTimingMiddleware",
     'corsheaders.middleware.CorsMiddleware',
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -121,14 +127,37 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "app.wsgi.application"
 
+# Connections are kept in a psycopg pool per process when DATABASE_POOL is
+# set, instead of being opened and closed for every request. The pool
+# statistics are served at /api/v1/db/pool/stats/.
+if os.getenv("DATABASE_POOL", "").lower() in ("1", "true", "yes"):
+    DATABASE_POOL_SETTINGS = {
+        "OPTIONS": {"pool": {
+            "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", 10)),
+            # Seconds a request waits for a free connection before failing
+            "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", 10)),
+            # Seconds after which connections are replaced, and idle ones closed
+            "max_lifetime": float(os.getenv("DATABASE_POOL_MAX_LIFETIME", 1800)),
+            "max_idle": float(os.getenv("DATABASE_POOL_MAX_IDLE", 600)),
+        }},
+        # Django gives the pool ConnectionPool.check_connection, which tests
+        # every connection before the pool hands it out
+        "CONN_HEALTH_CHECKS": os.getenv("DATABASE_POOL_HEALTH_CHECKS", "true").lower()
+        in ("1", "true", "yes"),
+    }
+else:
+    DATABASE_POOL_SETTINGS = {}
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "pft.postgresql",
         "NAME": os.getenv("DATABASE_NAME"),
         "USER": os.getenv("DATABASE_USER"),
         "PASSWORD": os.getenv("DATABASE_PASSWORD"),
         "HOST": os.getenv("DATABASE_HOST"),
         "PORT": os.getenv("DATABASE_PORT", "5432"),
+        **DATABASE_POOL_SETTINGS,
     }
 }
 
@@ -158,3 +187,92 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Shared cache, required in production (see prod.py); per-process memory
+# otherwise, where a write only invalidates the cached responses of the
+# process that made it
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Number of rows written per INSERT by the transaction import endpoint
+PFT_IMPORT_BATCH_SIZE = int(os.getenv("PFT_IMPORT_BATCH_SIZE", 1000))
+
+# Rows fetched per round trip from the server-side cursor of the transaction export
+PFT_EXPORT_CHUNK_SIZE = int(os.getenv("PFT_EXPORT_CHUNK_SIZE", 2000))
+
+# Maximum number of items accepted by the transaction batch endpoints
+PFT_BATCH_MAX_SIZE = int(os.getenv("PFT_BATCH_MAX_SIZE", 1000))
+
+# Seconds a cached read endpoint response is kept (see pft/cache.py)
+PFT_RESPONSE_CACHE_TIMEOUT = int(os.getenv("PFT_RESPONSE_CACHE_TIMEOUT", 3600))
+
+# Threads running the aggregates of the async dashboard views, and so the
+# most database connections they use at once: keep it below
+# DATABASE_POOL_MAX_SIZE
+PFT_ASYNC_DB_WORKERS = int(os.getenv("PFT_ASYNC_DB_WORKERS", 5))
+
+# Outgoing mail (bill reminder notifications); printed to the console unless
+# an SMTP backend is configured
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 25))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False") == "True"
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "webmaster@localhost")
+
+# Days before its due date a bill reminder notification is sent
+PFT_BILL_NOTICE_DAYS = int(os.getenv("PFT_BILL_NOTICE_DAYS", 3))
+
+# Bill reminders claimed per transaction by the process_bill_reminders command
+PFT_BILL_PROCESSING_CHUNK_SIZE = int(os.getenv("PFT_BILL_PROCESSING_CHUNK_SIZE", 500))
+
+# Subscriptions claimed per transaction by the renew_subscriptions command
+PFT_RENEWAL_CHUNK_SIZE = int(os.getenv("PFT_RENEWAL_CHUNK_SIZE", 500))
+
+# Seconds a user's token epoch and active flag are cached by the JWT
+# authentication; saving the user clears them, but other processes of a
+# LocMemCache setup may accept revoked tokens for up to this long
+PFT_TOKEN_STATE_CACHE_TIMEOUT = int(os.getenv("PFT_TOKEN_STATE_CACHE_TIMEOUT", 60))
+
+# Request instrumentation (see pft/middleware.py): Server-Timing headers, and
+# a log line per request on the pft.requests logger. Requests over either
+# threshold are logged as warnings with their slowest statements and the
+# statements they ran at least PFT_REPEATED_QUERY_THRESHOLD times (N+1).
+# The headers expose the timings to every client: unless PFT_SERVER_TIMING
+# is set, they are only sent with DEBUG on.
+PFT_SERVER_TIMING = (
+    os.getenv("PFT_SERVER_TIMING").lower() in ("1", "true", "yes")
+    if os.getenv("PFT_SERVER_TIMING") else None
+)
+PFT_SLOW_REQUEST_MS = float(os.getenv("PFT_SLOW_REQUEST_MS", 500))
+PFT_SLOW_REQUEST_QUERIES = int(os.getenv("PFT_SLOW_REQUEST_QUERIES", 50))
+PFT_SLOW_REQUEST_TOP_QUERIES = int(os.getenv("PFT_SLOW_REQUEST_TOP_QUERIES", 5))
+PFT_REPEATED_QUERY_THRESHOLD = int(os.getenv("PFT_REPEATED_QUERY_THRESHOLD", 5))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "pft.requests": {
+            "handlers": ["console"],
+            # WARNING to log the slow requests only
+            "level": os.getenv("PFT_REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
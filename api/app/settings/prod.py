@@ -62,11 +62,20 @@ CSRF_TRUSTED_ORIGINS = [
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "pft.postgresql",
         "NAME": os.environ.get("POSTGRES_DB"),
         "USER": os.environ.get("POSTGRES_USER"),
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
         "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
         "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        **DATABASE_POOL_SETTINGS,
     }
 }
+
+# Every process caches responses and the data versions that invalidate them
+# (pft/cache.py): without a shared cache a write only invalidates the process
+# that made it, and the others serve stale responses until they expire
+if not os.getenv("REDIS_URL"):
+    from django.core.exceptions import ImproperlyConfigured
+
+    raise ImproperlyConfigured("REDIS_URL must be set in production: the cache has to be shared")
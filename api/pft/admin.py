@@ -4,7 +4,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import (
     Category, Subscription, SubscriptionPlan, Transaction, Budget, User,
     AnalyticsReport, SavingsGoal, BillReminder, DebtAccount, DebtPayment,
-    Investment, InvestmentValue
+    Investment, InvestmentValue, ReportJob
 )
 
 class TransactionAdminForm(forms.ModelForm):
@@ -65,6 +65,14 @@ class AnalyticsReportAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
 
 
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ('user', 'report_type', 'start_date', 'end_date', 'status', 'created_at', 'finished_at')
+    list_filter = ('status', 'report_type')
+    search_fields = ('user__email',)
+    readonly_fields = ('report', 'created_at', 'updated_at', 'finished_at')
+
+
 @admin.register(SavingsGoal)
 class SavingsGoalAdmin(admin.ModelAdmin):
     list_display = ('title', 'user', 'target_amount', 'current_amount', 'target_date', 'status')
@@ -78,7 +86,7 @@ class BillReminderAdmin(admin.ModelAdmin):
     list_display = ('title', 'user', 'amount', 'due_date', 'recurrence', 'status')
     list_filter = ('status', 'recurrence', 'user')
     search_fields = ('title', 'user__email')
-    readonly_fields = ('created_at', 'updated_at', 'notification_sent')
+    readonly_fields = ('created_at', 'updated_at', 'notification_sent', 'next_occurrence')
 
 
 class DebtPaymentInline(admin.TabularInline):
@@ -107,9 +115,14 @@ class InvestmentAdmin(admin.ModelAdmin):
     list_display = ('name', 'user', 'symbol', 'type', 'purchase_price', 'quantity', 'purchase_date')
     list_filter = ('type', 'user')
     search_fields = ('name', 'symbol', 'user__email')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('current_value', 'current_value_date', 'created_at', 'updated_at')
     inlines = [InvestmentValueInline]
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # The inline may have added, edited or removed the latest value
+        form.instance.refresh_current_value()
+
 admin.site.register(Category)
 admin.site.register(Budget)
 admin.site.register(Subscription)
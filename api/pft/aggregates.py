@@ -0,0 +1,202 @@
+"""
+Aggregate read models shared by the DRF viewsets and the async dashboard.
+
+Each function takes a user, runs a fixed number of queries and returns plain
+JSON-ready data, so several of them can run side by side.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import (
+    Count,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import (
+    BillReminder,
+    Budget,
+    DebtAccount,
+    Investment,
+    Subscription,
+    TransactionRollup,
+)
+
+
+def _valuation(total_invested, current_value):
+    return {
+        'total_invested': str(total_invested),
+        'current_value': str(current_value),
+        'total_gain_loss': str(current_value - total_invested),
+        'gain_loss_percentage': str((current_value - total_invested) / total_invested * 100 if total_invested > 0 else 0)
+    }
+
+
+def portfolio_summary(user):
+    invested = ExpressionWrapper(
+        F('purchase_price') * F('quantity'),
+        output_field=DecimalField(max_digits=24, decimal_places=6)
+    )
+    # One grouped query: every holding is valued at its latest recorded
+    # value (Investment.current_value), falling back to its cost.
+    rows = (
+        Investment.objects.filter(user=user)
+        .annotate(invested=invested)
+        .annotate(current=Coalesce('current_value', 'invested'))
+        .values('type')
+        .annotate(total_invested=Sum('invested'), current_value=Sum('current'))
+        .order_by('type')
+    )
+
+    total_invested = 0
+    current_value = 0
+    by_type = {}
+    for row in rows:
+        total_invested += row['total_invested']
+        current_value += row['current_value']
+        by_type[row['type']] = _valuation(row['total_invested'], row['current_value'])
+
+    return {
+        **_valuation(total_invested, current_value),
+        'by_type': by_type
+    }
+
+
+def subscription_statistics(user):
+    rows = (
+        Subscription.objects.filter(user=user, status='active')
+        .values('plan__type')
+        .annotate(count=Count('id'), total_amount=Sum('amount'))
+        .order_by()
+    )
+    by_type = {
+        row['plan__type']: {
+            'count': row['count'],
+            'total_amount': float(row['total_amount'])
+        }
+        for row in rows
+    }
+
+    return {
+        'total_active_subscriptions': sum(row['count'] for row in rows),
+        'total_monthly_amount': sum(row['total_amount'] for row in rows),
+        'by_type': by_type
+    }
+
+
+def monthly_summary(user, year, month):
+    # A calendar month is exactly one TransactionRollup bucket per
+    # (category, type).
+    rows = (
+        TransactionRollup.objects.filter(user=user, year=year, month=month)
+        .annotate(category_name=Coalesce('category__name', Value('Uncategorized')))
+        .values('category_name', 'type')
+        .annotate(total=Sum('total'))
+        .order_by()
+    )
+
+    totals = {'income': 0, 'expense': 0}
+    by_category = {}
+    for row in rows:
+        totals[row['type']] += row['total']
+        amounts = by_category.setdefault(row['category_name'], {'income': '0', 'expense': '0'})
+        amounts[row['type']] = str(row['total'])
+
+    return {
+        'total_income': str(totals['income']),
+        'total_expenses': str(totals['expense']),
+        'by_category': by_category
+    }
+
+
+def _utilization(amount_limit, spent):
+    return {
+        'amount_limit': str(amount_limit),
+        'spent': str(spent),
+        'remaining': str(amount_limit - spent),
+        'percentage': str(round(spent / amount_limit * 100, 2) if amount_limit > 0 else 0)
+    }
+
+
+def budgets_with_spending(user, year, month=None):
+    """
+    The budgets of a month, or of every month of the year when month is
+    None, each annotated with its spending from the expense TransactionRollup
+    row of its (category, year, month).
+    """
+    spent = TransactionRollup.objects.filter(
+        user=OuterRef('user'),
+        category=OuterRef('category'),
+        year=OuterRef('year'),
+        month=OuterRef('month'),
+        type='expense'
+    ).values('total')
+    budgets = (
+        Budget.objects.filter(user=user, year=year)
+        .select_related('category')
+        .annotate(spent=Coalesce(
+            Subquery(spent), Value(Decimal('0')),
+            output_field=DecimalField(max_digits=14, decimal_places=2)
+        ))
+        .order_by('month', 'category__name', 'id')
+    )
+    if month is not None:
+        budgets = budgets.filter(month=month)
+    return budgets
+
+
+def budget_utilization(user, year, month=None):
+    """Spending against each budget of the period, in one query."""
+    rows = []
+    total_limit = total_spent = 0
+    for budget in budgets_with_spending(user, year, month):
+        total_limit += budget.amount_limit
+        total_spent += budget.spent
+        rows.append({
+            'id': budget.id,
+            'category': budget.category_id,
+            'category_name': budget.category.name,
+            'year': budget.year,
+            'month': budget.month,
+            **_utilization(budget.amount_limit, budget.spent)
+        })
+
+    return {
+        'year': year,
+        'month': month,
+        **_utilization(total_limit, total_spent),
+        'budgets': rows
+    }
+
+
+def upcoming_bills(user, days=7):
+    today = timezone.now().date()
+    totals = BillReminder.objects.filter(
+        user=user,
+        due_date__range=[today, today + timedelta(days=days)],
+        status='pending'
+    ).aggregate(count=Count('id'), total_amount=Sum('amount'))
+    return {
+        'count': totals['count'],
+        'total_amount': str(totals['total_amount'] or 0)
+    }
+
+
+def debt_overview(user):
+    totals = DebtAccount.objects.filter(user=user, status='active').aggregate(
+        count=Count('id'),
+        total_balance=Sum('balance'),
+        total_minimum_payment=Sum('minimum_payment')
+    )
+    return {
+        'active_accounts': totals['count'],
+        'total_balance': str(totals['total_balance'] or 0),
+        'total_minimum_payment': str(totals['total_minimum_payment'] or 0)
+    }
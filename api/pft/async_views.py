@@ -0,0 +1,161 @@
+"""
+Async read endpoints for the dashboard and the aggregate summaries.
+
+Django's async ORM still runs every query through one thread per request, so
+awaiting several of them with asyncio.gather() does not overlap them. The
+aggregates are therefore run on a pool of PFT_ASYNC_DB_WORKERS threads, each
+with a database connection of its own, and the response waits for the
+slowest one only. The workers outlive the requests, so they give up their
+connections after every aggregate the way a request does (CONN_MAX_AGE, or
+back to the pool).
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from . import aggregates
+from .authentication import ClaimsJWTAuthentication
+from .cache import get_cached_data, response_key
+
+# Same number formatting as the DRF JSON renderer
+json_response = partial(JsonResponse, encoder=JSONEncoder)
+
+# Bounds the connections the async views hold, however many dashboards are
+# requested at once; the requests beyond it wait for a worker.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PFT_ASYNC_DB_WORKERS, thread_name_prefix='pft-aggregates'
+)
+
+
+def _release_connections():
+    """
+    Pooled connections go back to the pool, for the aggregates to use.
+    Without a pool the connection is kept for the rest of the request, unless
+    it broke.
+    """
+    for connection in connections.all(initialized_only=True):
+        if getattr(connection, 'pool', None) is not None:
+            connection.close()
+        elif connection.errors_occurred:
+            if connection.is_usable():
+                connection.errors_occurred = False
+            else:
+                connection.close()
+
+
+def _run(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # No request_finished signal closes the connections of the workers
+        close_old_connections()
+
+
+async def gather(*calls):
+    """Run (func, *args) calls concurrently on the aggregate workers."""
+    return await asyncio.gather(*(
+        sync_to_async(_run, thread_sensitive=False, executor=_executor)(*call)
+        for call in calls
+    ))
+
+
+@sync_to_async
+def _authenticate(request):
+    try:
+        result = ClaimsJWTAuthentication().authenticate(request)
+    except (AuthenticationFailed, InvalidToken):
+        return None
+    finally:
+        # A token state lookup would otherwise hold a pooled connection
+        # while the aggregates wait for theirs
+        _release_connections()
+    return result[0] if result else None
+
+
+def authenticated(view):
+    """The JWT authentication of the DRF views, for plain async views."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await _authenticate(request)
+        if user is None:
+            return json_response(
+                {'detail': 'Authentication credentials were not provided or are invalid.'},
+                status=401
+            )
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def cached(view):
+    """
+    cache.cached_response for the async views, which return the data to
+    answer with instead of a response.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        key = await sync_to_async(response_key)(request, f'async_views.{view.__name__}')
+        data = await sync_to_async(get_cached_data)(key)
+        if data is None:
+            data = await view(request, *args, **kwargs)
+            await sync_to_async(cache.set)(key, data, settings.PFT_RESPONSE_CACHE_TIMEOUT)
+        return json_response(data)
+    return wrapper
+
+
+@require_GET
+@authenticated
+@cached
+async def dashboard(request):
+    today = timezone.now().date()
+    portfolio, subscriptions, monthly, bills, debts = await gather(
+        (aggregates.portfolio_summary, request.user),
+        (aggregates.subscription_statistics, request.user),
+        (aggregates.monthly_summary, request.user, today.year, today.month),
+        (aggregates.upcoming_bills, request.user),
+        (aggregates.debt_overview, request.user),
+    )
+    return {
+        'portfolio': portfolio,
+        'subscriptions': subscriptions,
+        'monthly_summary': monthly,
+        'upcoming_bills': bills,
+        'debts': debts,
+    }
+
+
+@require_GET
+@authenticated
+@cached
+async def portfolio_summary(request):
+    data, = await gather((aggregates.portfolio_summary, request.user))
+    return data
+
+
+@require_GET
+@authenticated
+@cached
+async def subscription_statistics(request):
+    data, = await gather((aggregates.subscription_statistics, request.user))
+    return data
+
+
+@require_GET
+@authenticated
+@cached
+async def monthly_summary(request):
+    """The current month's summary, without storing an AnalyticsReport"""
+    today = timezone.now().date()
+    data, = await gather((aggregates.monthly_summary, request.user, today.year, today.month))
+    return data
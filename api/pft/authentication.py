@@ -0,0 +1,132 @@
+"""
+JWT authentication without a user lookup per request.
+
+Access tokens carry the claims the views need (email, role, department,
+is_active) next to the user id, and the request user is built from them with
+every other field deferred: the full row is only loaded when a view touches
+one of those. Revocation goes through the user's token_epoch, also carried
+in the tokens, which is checked against a short lived cache entry instead
+of the database.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+TOKEN_STATE_KEY = 'pft:token-state:{}'
+CLAIM_FIELDS = ('email', 'role', 'department', 'is_active', 'token_epoch')
+
+
+def add_claims(token, user):
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    return token
+
+
+def get_token_state(user_id):
+    """
+    The (token_epoch, is_active) of the user, or None if there is no such
+    user. Cached for PFT_TOKEN_STATE_CACHE_TIMEOUT seconds; saving the user
+    drops the entry (see signals.py).
+    """
+    key = TOKEN_STATE_KEY.format(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = get_user_model().objects.filter(pk=user_id).values_list(
+            'token_epoch', 'is_active'
+        ).first()
+        if state is None:
+            return None
+        cache.set(key, state, timeout=settings.PFT_TOKEN_STATE_CACHE_TIMEOUT)
+    return state
+
+
+def check_token_state(token, user_id):
+    """The (token_epoch, is_active) of the token's user, if the token is still valid."""
+    state = get_token_state(user_id)
+    if state is None:
+        raise exceptions.AuthenticationFailed(_("User not found"), code="user_not_found")
+    token_epoch, is_active = state
+    if token.get('token_epoch', 0) != token_epoch:
+        raise InvalidToken(_("Token has been revoked"))
+    if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+        raise exceptions.AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    return state
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication building the request user from the token claims."""
+
+    def get_user(self, validated_token):
+        if not all(field in validated_token for field in CLAIM_FIELDS):
+            # Issued before the claims were added
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        token_epoch, is_active = check_token_state(validated_token, user_id)
+        values = {field: validated_token[field] for field in CLAIM_FIELDS}
+        values.update({
+            api_settings.USER_ID_FIELD: user_id,
+            'token_epoch': token_epoch,
+            'is_active': is_active,
+        })
+        field_names = [
+            f.attname for f in self.user_model._meta.concrete_fields if f.attname in values
+        ]
+        user = self.user_model.from_db(
+            router.db_for_read(self.user_model),
+            field_names,
+            [values[name] for name in field_names]
+        )
+        # Refuses to be saved (see User.save)
+        user._from_claims = True
+        return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Rejects refresh tokens revoked by a token_epoch bump, and issues the
+    access token with claims read afresh from the user, so role or email
+    changes reach the tokens within one access token lifetime.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}
+        ).only(*CLAIM_FIELDS).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(
+                self.error_messages['no_active_account'], 'no_active_account'
+            )
+        if refresh.get('token_epoch', 0) != user.token_epoch:
+            raise InvalidToken(_("Token has been revoked"))
+
+        data = {'access': str(add_claims(refresh.access_token, user))}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION and hasattr(refresh, 'blacklist'):
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(add_claims(refresh, user))
+        return data
@@ -0,0 +1,138 @@
+"""
+Bill reminder processing, run by the process_bill_reminders command.
+
+Reminders are claimed in chunks with SELECT ... FOR UPDATE SKIP LOCKED, so
+several workers can process the table side by side, each chunk in its own
+transaction. Every processed reminder leaves the claim filter, so a pass
+ends once no chunk is left and memory stays bounded by the chunk size.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .models import BillReminder, add_months
+
+
+def next_due_date(due_date, recurrence, on_or_after=None):
+    """
+    The due date following due_date, keeping the day of the month where it
+    exists. With on_or_after, the first one that is not before that date:
+    the periods missed in between are skipped.
+    """
+    periods = 1
+    while True:
+        if recurrence == 'weekly':
+            date = due_date + timedelta(days=7 * periods)
+        elif recurrence == 'monthly':
+            date = add_months(due_date, periods)
+        elif recurrence == 'yearly':
+            date = add_months(due_date, 12 * periods)
+        else:
+            raise ValueError(f"Reminders recurring {recurrence!r} have no next occurrence")
+        if on_or_after is None or date >= on_or_after:
+            return date
+        periods += 1
+
+
+def claim_chunk(today, notice_date, size):
+    """
+    Lock up to size reminders with work left that no other worker holds:
+    pending ones past their due date (to mark overdue) or due by notice_date
+    without a notification, and recurring ones whose next occurrence is due
+    to be created. Must be called in a transaction.
+    """
+    return list(
+        # of=('self',): the joined users must stay free for other workers
+        BillReminder.objects.select_for_update(skip_locked=True, of=('self',))
+        .select_related('user')
+        .filter(
+            Q(status='pending', due_date__lt=today)
+            | Q(status='pending', notification_sent=False, due_date__lte=notice_date)
+            | (~Q(recurrence='once') & Q(next_occurrence__isnull=True, due_date__lte=today))
+        )
+        .order_by('due_date', 'id')[:size]
+    )
+
+
+def notification_message(reminder, today):
+    if reminder.due_date < today:
+        subject = f"Overdue bill: {reminder.title}"
+        body = f"Your bill \"{reminder.title}\" of {reminder.amount} was due on {reminder.due_date}."
+    else:
+        subject = f"Upcoming bill: {reminder.title}"
+        body = f"Your bill \"{reminder.title}\" of {reminder.amount} is due on {reminder.due_date}."
+    return (subject, body, None, [reminder.user.email])
+
+
+def process_chunk(today=None, notice_days=None, size=None):
+    """
+    Claim and process one chunk of reminders in a single transaction.
+    Returns the number of reminders processed, 0 once there is no work left.
+    """
+    today = today or timezone.now().date()
+    notice_days = settings.PFT_BILL_NOTICE_DAYS if notice_days is None else notice_days
+    size = size or settings.PFT_BILL_PROCESSING_CHUNK_SIZE
+    now = timezone.now()
+
+    with transaction.atomic():
+        reminders = claim_chunk(today, today + timedelta(days=notice_days), size)
+        if not reminders:
+            return 0
+
+        overdue = [r.pk for r in reminders if r.status == 'pending' and r.due_date < today]
+        if overdue:
+            BillReminder.objects.filter(pk__in=overdue).update(status='overdue', updated_at=now)
+
+        rolled = [
+            r for r in reminders
+            if r.recurrence != 'once' and r.next_occurrence_id is None and r.due_date <= today
+        ]
+        # A reminder left behind for more than a period (one created before
+        # the processor ran, or while it was stopped) rolls straight to its
+        # next due date from today on, instead of one occurrence per missed
+        # period. Its missed periods are not notified either.
+        caught_up = [
+            r for r in rolled
+            if r.status == 'pending' and next_due_date(r.due_date, r.recurrence) < today
+        ]
+        occurrences = BillReminder.objects.bulk_create(
+            BillReminder(
+                user_id=r.user_id,
+                title=r.title,
+                amount=r.amount,
+                due_date=next_due_date(r.due_date, r.recurrence, on_or_after=today),
+                recurrence=r.recurrence
+            )
+            for r in rolled
+        )
+        for reminder, occurrence in zip(rolled, occurrences, strict=True):
+            reminder.next_occurrence = occurrence
+        for reminder in caught_up:
+            reminder.notification_sent = True
+
+        notified = [
+            r for r in reminders
+            if r.status == 'pending' and not r.notification_sent
+            and r.due_date <= today + timedelta(days=notice_days)
+        ]
+        # Sent before the flags are committed: a failure rolls the chunk back
+        # and the reminders are notified on the next run instead of never.
+        send_mass_mail([notification_message(r, today) for r in notified])
+        for reminder in notified:
+            reminder.notification_sent = True
+
+        changed = {r.pk: r for r in rolled + notified}.values()
+        for reminder in changed:
+            reminder.updated_at = now
+        BillReminder.objects.bulk_update(
+            changed, ['next_occurrence', 'notification_sent', 'updated_at']
+        )
+
+        # The bulk writes above bypass the model signals
+        bump_data_version(*{r.user_id for r in reminders})
+    return len(reminders)
@@ -0,0 +1,113 @@
+"""
+Per-user response cache for the expensive read endpoints.
+
+Every cached response is keyed by the user's data version and the version of
+the data shared by all users. Writes bump the matching version, so stale
+entries are never read again and simply expire; nothing has to be searched
+for or deleted.
+"""
+import hashlib
+import time
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'pft:data-version:{}'
+RESPONSE_KEY = 'pft:response:{}:{}:{}:{}:{}'
+GLOBAL = 'global'
+STATS_KEY = 'pft:cache-stats:{}'
+
+
+def _incr(key):
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted in between
+            pass
+
+
+def get_data_versions(user_id):
+    """The data versions of the user and of the shared data, in one round trip."""
+    keys = [VERSION_KEY.format(user_id), VERSION_KEY.format(GLOBAL)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seeded from the clock rather than 1 so that a version key which
+            # was evicted never comes back as a value that older responses
+            # were cached under.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(user_ids):
+    for user_id in user_ids:
+        try:
+            cache.incr(VERSION_KEY.format(user_id))
+        except ValueError:
+            cache.add(VERSION_KEY.format(user_id), time.time_ns(), timeout=None)
+
+
+def bump_data_version(*user_ids):
+    """
+    Invalidate every cached response of the given users, or of everyone for
+    None (shared data such as subscription plans). Inside a transaction this
+    waits for the commit, so no other request can cache the old data under
+    the new version.
+    """
+    user_ids = {GLOBAL if user_id is None else user_id for user_id in user_ids}
+    if user_ids:
+        transaction.on_commit(partial(_bump, user_ids))
+
+
+def response_key(request, name):
+    """Cache key of the response of the named endpoint to the request."""
+    user_version, global_version = get_data_versions(request.user.pk)
+    return RESPONSE_KEY.format(
+        request.user.pk,
+        f'{user_version}.{global_version}',
+        name,
+        timezone.now().date().isoformat(),
+        hashlib.md5(request.get_full_path().encode()).hexdigest()
+    )
+
+
+def get_cached_data(key):
+    data = cache.get(key)
+    _incr(STATS_KEY.format('misses' if data is None else 'hits'))
+    return data
+
+
+def cached_response(view_method):
+    """
+    Cache the successful responses of a viewset action per user, data version,
+    query string and day (several endpoints are relative to today).
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = response_key(request, f'{type(self).__name__}.{view_method.__name__}')
+        data = get_cached_data(key)
+        if data is not None:
+            return Response(data)
+
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.PFT_RESPONSE_CACHE_TIMEOUT)
+        return response
+    return wrapper
+
+
+def get_stats():
+    hits = cache.get(STATS_KEY.format('hits'), 0)
+    misses = cache.get(STATS_KEY.format('misses'), 0)
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / (hits + misses) if hits + misses else 0,
+    }
@@ -0,0 +1,56 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+
+class ConditionalListMixin:
+    """
+    Conditional GET for the list action. One aggregate query over the
+    filtered queryset yields a validator (latest modification, row count)
+    that is hashed with the URL into an ETag; when it matches the client's
+    If-None-Match the list is answered with 304 without being serialized.
+
+    The validator comes from the database rather than a cache, so writes
+    made by other processes (the other workers, the cron commands, the
+    report worker) change it as well.
+
+    Views whose rows render data from related tables list those timestamps
+    in ``last_modified_fields`` as well, and the nullable relations they
+    render in ``counted_fields``: a SET_NULL delete clears those without
+    touching a timestamp.
+    """
+    last_modified_fields = ('updated_at',)
+    counted_fields = ()
+
+    def get_list_validator(self, queryset):
+        aggregates = {field: Max(field) for field in self.last_modified_fields}
+        aggregates.update({f'{field}_count': Count(field) for field in self.counted_fields})
+        validator = queryset.aggregate(count=Count('pk'), **aggregates)
+        timestamps = [validator[field] for field in self.last_modified_fields if validator[field]]
+        validator['last_modified'] = max(timestamps, default=None)
+        return validator
+
+    def list(self, request, *args, **kwargs):
+        validator = self.get_list_validator(self.filter_queryset(self.get_queryset()))
+        etag = quote_etag(hashlib.md5(repr((
+            request.user.pk,
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            sorted(validator.items())
+        )).encode()).hexdigest())
+
+        # Only the ETag is checked: Last-Modified alone cannot tell that a
+        # row was deleted, so If-Modified-Since is not trusted on its own.
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            if validator['last_modified'] is not None:
+                response['Last-Modified'] = http_date(validator['last_modified'].timestamp())
+            # Let the browser keep the list but always revalidate it
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
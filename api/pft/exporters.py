@@ -0,0 +1,68 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+EXPORT_COLUMNS = ('id', 'date', 'title', 'amount', 'type', 'category')
+EXPORT_FIELDS = ('id', 'transaction_date', 'title', 'amount', 'type', 'category__name')
+
+
+class Echo:
+    """File-like object whose write() hands the formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+_csv = csv.writer(Echo())
+
+
+def csv_row(row):
+    id, date, title, amount, type, category = row
+    return _csv.writerow((id, date.isoformat(), title, amount, type, category or ''))
+
+
+def ndjson_row(row):
+    record = dict(zip(EXPORT_COLUMNS, row, strict=True))
+    record['date'] = record['date'].isoformat()
+    record['amount'] = str(record['amount'])
+    return json.dumps(record) + '\n'
+
+
+# file_type -> (content type, header line, row formatter)
+FORMATS = {
+    'csv': ('text/csv', _csv.writerow(EXPORT_COLUMNS), csv_row),
+    'ndjson': ('application/x-ndjson', '', ndjson_row),
+}
+
+
+def stream(file_type, rows):
+    _, header, format_row = FORMATS[file_type]
+    if header:
+        yield header
+    for row in rows:
+        yield format_row(row)
+
+
+async def astream(file_type, rows):
+    """stream() over an async iterator of rows, for responses served under ASGI."""
+    _, header, format_row = FORMATS[file_type]
+    if header:
+        yield header
+    async for row in rows:
+        yield format_row(row)
+
+
+async def aiterator(queryset, chunk_size):
+    """
+    queryset.iterator() for an async context, fetched a chunk at a time on
+    the request's sync thread, which holds the server-side cursor.
+    QuerySet.aiterator() runs the query of values_list() querysets in the
+    event loop and fails.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    next_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    while chunk := await next_chunk():
+        for row in chunk:
+            yield row
@@ -0,0 +1,169 @@
+import csv
+import datetime
+import io
+import re
+from decimal import Decimal, InvalidOperation
+
+from .models import Category, Transaction
+
+TITLE_MAX_LENGTH = Transaction._meta.get_field('title').max_length
+AMOUNT_MAX_DIGITS = Transaction._meta.get_field('amount').max_digits
+TWO_PLACES = Decimal('0.01')
+
+CSV_COLUMNS = {
+    'date': ('date', 'transaction_date', 'posted', 'booking date'),
+    'title': ('title', 'description', 'payee', 'name', 'memo'),
+    'amount': ('amount', 'value'),
+    'type': ('type',),
+    'category': ('category',),
+}
+
+OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)')
+
+
+class ImportFormatError(Exception):
+    """The uploaded file cannot be read as the requested format."""
+
+
+def _csv_columns(fieldnames):
+    """Map the normalized field names to the CSV columns holding them, or None."""
+    header = {name.strip().lower(): name for name in fieldnames if name}
+    columns = {
+        key: next((header[alias] for alias in aliases if alias in header), None)
+        for key, aliases in CSV_COLUMNS.items()
+    }
+    missing = [key for key in ('date', 'title', 'amount') if columns[key] is None]
+    if missing:
+        raise ImportFormatError(f"The CSV file is missing the column(s): {', '.join(missing)}.")
+    return columns
+
+
+def iter_csv_rows(file):
+    """Yield one normalized dict per CSV data row, reading the file lazily."""
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding='utf-8-sig', newline=''))
+    if not reader.fieldnames:
+        raise ImportFormatError('The CSV file has no header row.')
+
+    columns = _csv_columns(reader.fieldnames)
+    for row in reader:
+        yield {key: (row.get(column) or '').strip() if column else '' for key, column in columns.items()}
+
+
+def iter_ofx_rows(file):
+    """
+    Yield one normalized dict per OFX <STMTTRN> block. Handles both the SGML
+    (unclosed leaf tags) and the XML flavours of OFX, one line at a time.
+    """
+    text = io.TextIOWrapper(file, encoding='utf-8', errors='replace')
+    current = None
+    for line in text:
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if closing and current is not None:
+                    yield _ofx_row(current)
+                    current = None
+                elif not closing:
+                    current = {}
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+    if current is not None:
+        yield _ofx_row(current)
+
+
+def _ofx_row(fields):
+    return {
+        # DTPOSTED is YYYYMMDD optionally followed by a time and timezone
+        'date': fields.get('DTPOSTED', '')[:8],
+        'title': fields.get('NAME') or fields.get('MEMO', ''),
+        'amount': fields.get('TRNAMT', ''),
+        'type': '',
+        'category': '',
+    }
+
+
+PARSERS = {
+    'csv': iter_csv_rows,
+    'ofx': iter_ofx_rows,
+    'qfx': iter_ofx_rows,
+}
+
+
+def load_category_map(user):
+    """Map lowercased category names to ids, the user's own winning over global ones."""
+    categories = Category.objects.filter(user=user) | Category.objects.filter(user__isnull=True)
+    mapping = {}
+    for category_id, name, owner_id in categories.values_list('id', 'name', 'user_id').order_by('user_id'):
+        if owner_id is not None or name.lower() not in mapping:
+            mapping[name.lower()] = category_id
+    return mapping
+
+
+def _parse_title(value, errors):
+    if not value:
+        errors.append('Title is required.')
+    elif len(value) > TITLE_MAX_LENGTH:
+        errors.append(f'Title must be at most {TITLE_MAX_LENGTH} characters.')
+    return value
+
+
+def _parse_date(value, errors):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        errors.append('Date must be in YYYY-MM-DD format.')
+        return None
+
+
+def _parse_amount(value, errors):
+    try:
+        amount = Decimal(value.replace(',', '')).quantize(TWO_PLACES)
+        if not amount.is_finite() or len(amount.as_tuple().digits) > AMOUNT_MAX_DIGITS:
+            raise InvalidOperation
+    except (InvalidOperation, ValueError):
+        errors.append('Amount must be a number.')
+        return None
+    return amount
+
+
+def _parse_type(value, amount, errors):
+    """The given type, else guessed from the sign of the amount as OFX files have none."""
+    type = value.lower()
+    if type and type not in dict(Transaction.TYPE_CHOICES):
+        errors.append('Type must be "income" or "expense".')
+    elif not type and amount is not None:
+        type = 'expense' if amount < 0 else 'income'
+    return type
+
+
+def _parse_category(value, categories, errors):
+    if not value:
+        return None
+    category_id = categories.get(value.lower())
+    if category_id is None:
+        errors.append(f"Unknown category \"{value}\".")
+    return category_id
+
+
+def build_transaction(row, user, categories):
+    """
+    Turn a normalized row into an unsaved Transaction without touching the
+    database. Raises ValueError with the list of problems if it is invalid.
+    """
+    errors = []
+    title = _parse_title(row['title'], errors)
+    transaction_date = _parse_date(row['date'], errors)
+    amount = _parse_amount(row['amount'], errors)
+    type = _parse_type(row['type'], amount, errors)
+    category_id = _parse_category(row['category'], categories, errors)
+    if errors:
+        raise ValueError(errors)
+
+    return Transaction(
+        user_id=user.pk,
+        title=title,
+        amount=abs(amount),
+        type=type,
+        category_id=category_id,
+        transaction_date=transaction_date,
+    )
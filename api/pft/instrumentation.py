@@ -0,0 +1,124 @@
+"""
+Per-request measurements: SQL statements, serializer time and view time,
+collected for the request RequestTimingMiddleware (pft/middleware.py) is
+serving and reported by it.
+
+The measurements of a request live in a context variable, so they follow the
+request into the threads sync_to_async hands its work to (the dashboard runs
+its queries side by side on several connections) and stay apart from the
+requests served concurrently.
+"""
+import re
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+_metrics = ContextVar('pft_request_metrics', default=None)
+# Set while a serializer is timed, so nested serializers are not counted twice
+_serializing = ContextVar('pft_serializing', default=False)
+
+# "IN (%s, %s, %s)" lists of any length are the same statement, and so are
+# the savepoints of every atomic block
+PARAMETER_LIST = re.compile(r'%s(?:\s*,\s*%s)+')
+SAVEPOINT_ID = re.compile(r'"s\d+_x\d+"')
+WHITESPACE = re.compile(r'\s+')
+
+
+def statement_pattern(sql):
+    sql = SAVEPOINT_ID.sub('"s..."', PARAMETER_LIST.sub('%s, ...', sql))
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_finished = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        # statement pattern -> [executions, total seconds, slowest seconds]
+        self.statements = {}
+
+    def add_query(self, sql, duration):
+        pattern = statement_pattern(sql)
+        with self._lock:
+            self.queries += 1
+            self.db_time += duration
+            stats = self.statements.setdefault(pattern, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+
+    def add_serializer_time(self, duration):
+        with self._lock:
+            self.serializer_time += duration
+
+    def slowest_statements(self, limit):
+        """The limit statements with the slowest single execution."""
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][2], reverse=True)
+        return [
+            {'sql': sql, 'ms': round(slowest * 1000, 2)}
+            for sql, (_, _, slowest) in ranked[:limit]
+        ]
+
+    def repeated_statements(self, threshold):
+        """
+        Statements run at least threshold times, most often first: a query
+        per row of a list, the N+1 pattern, shows up here.
+        """
+        repeated = [
+            {'sql': sql, 'count': count, 'ms': round(total * 1000, 2)}
+            for sql, (count, total, _) in self.statements.items()
+            if count >= threshold
+        ]
+        return sorted(repeated, key=lambda statement: statement['count'], reverse=True)
+
+
+def start():
+    """Start measuring the current request; returns its metrics and the token for stop()."""
+    metrics = RequestMetrics()
+    return metrics, _metrics.set(metrics)
+
+
+def stop(token):
+    _metrics.reset(token)
+
+
+def current():
+    """The metrics of the request being served, or None outside of one."""
+    return _metrics.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper timing every statement of a measured request."""
+    metrics = _metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(sql, time.perf_counter() - start)
+
+
+def timed(method):
+    """
+    Counts the calls of method as serializer time of the measured request;
+    the calls nested in a timed one are counted with it.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        metrics = _metrics.get()
+        if metrics is None or _serializing.get():
+            return method(*args, **kwargs)
+        token = _serializing.set(True)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.add_serializer_time(time.perf_counter() - start)
+            _serializing.reset(token)
+    return wrapper
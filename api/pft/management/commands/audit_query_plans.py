@@ -0,0 +1,182 @@
+import re
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.http import HttpRequest
+from django.utils import timezone
+from rest_framework.request import Request
+
+from pft import aggregates, views
+from pft.search import search_query
+
+SEQ_SCAN = re.compile(r"Seq Scan on (pft_\w+)")
+
+
+def _all(view):
+    return view.get_queryset()
+
+
+def _list(view):
+    return view.get_queryset()[:view.paginator.page_size]
+
+
+def _keyset(view):
+    return view.get_queryset().order_by(*view.cursor_ordering)[:view.paginator.page_size]
+
+
+def _date_range(view):
+    today = timezone.now().date()
+    return view.get_queryset().filter(
+        transaction_date__range=[today.replace(day=1), today]
+    ).order_by(*view.cursor_ordering)[:view.paginator.page_size]
+
+
+def _search(view):
+    return view.get_queryset().filter(search_vector=search_query(['coffee']))
+
+
+def _monthly_rollups(view):
+    today = timezone.now().date()
+    return view.request.user.transaction_rollups.filter(year=today.year, month=today.month)
+
+
+def _budget_utilization(view):
+    today = timezone.now().date()
+    return aggregates.budgets_with_spending(view.request.user, today.year, today.month)
+
+
+def _upcoming_renewals(view):
+    return view.get_queryset().filter(
+        status='active',
+        next_billing_date__lte=timezone.now().date() + timedelta(days=30)
+    ).order_by('next_billing_date')
+
+
+def _upcoming_bills(view):
+    today = timezone.now().date()
+    return view.get_queryset().filter(
+        due_date__range=[today, today + timedelta(days=7)],
+        status='pending'
+    )
+
+
+# The main query shapes of every per-user viewset, with the index each one is
+# meant to be served by. Keep in sync with views.py and the model indexes.
+AUDITED_QUERIES = {
+    views.CategoryViewSet: [(_list, 'unique_category_name'), (_keyset, 'unique_category_name')],
+    views.TransactionViewSet: [
+        (_list, 'transaction_user_date_idx'),
+        (_keyset, 'transaction_user_date_idx'),
+        (_date_range, 'transaction_user_date_idx'),
+        (_search, 'transaction_search_idx'),
+        (_monthly_rollups, 'unique_transaction_rollup_bucket'),
+    ],
+    views.BudgetViewSet: [
+        (_list, 'budget_user_period_idx'),
+        (_keyset, 'budget_user_period_idx'),
+        (_budget_utilization, 'budget_user_period_idx'),
+    ],
+    views.SubscriptionViewSet: [
+        (_all, 'subscription_user_created_idx'),
+        (_upcoming_renewals, 'subscription_active_idx'),
+    ],
+    views.AnalyticsReportViewSet: [
+        (_list, 'report_user_created_idx'),
+        (_keyset, 'report_user_created_idx'),
+    ],
+    views.ReportJobViewSet: [
+        (_list, 'report_job_user_created_idx'),
+        (_keyset, 'report_job_user_created_idx'),
+    ],
+    views.SavingsGoalViewSet: [
+        (_list, 'goal_user_created_idx'),
+        (_keyset, 'goal_user_created_idx'),
+    ],
+    views.BillReminderViewSet: [
+        (_list, 'bill_user_due_idx'),
+        (_keyset, 'bill_user_due_idx'),
+        (_upcoming_bills, 'bill_pending_due_idx'),
+    ],
+    views.DebtAccountViewSet: [
+        (_list, 'debt_user_due_idx'),
+        (_keyset, 'debt_user_due_idx'),
+    ],
+    views.InvestmentViewSet: [
+        (_list, 'investment_user_created_idx'),
+        (_keyset, 'investment_user_created_idx'),
+    ],
+}
+
+
+def _get_view(viewset, user):
+    request = Request(HttpRequest())
+    request.user = user
+    return viewset(request=request, format_kwarg=None, action="list", kwargs={})
+
+
+def audit_plans(user):
+    """
+    EXPLAIN every audited query for the user. Yields (name, plan, problem),
+    problem being None when the plan uses the expected index and no
+    sequential scan.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # Seq scans are the cheapest plan on small tables, so make the
+            # planner pick between the indexes that could serve the query.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        for viewset, queries in AUDITED_QUERIES.items():
+            view = _get_view(viewset, user)
+            for query, index in queries:
+                name = f"{viewset.__name__}.{query.__name__.lstrip('_')}"
+                plan = query(view).explain()
+                tables = SEQ_SCAN.findall(plan)
+                if tables:
+                    problem = f"seq scan on {', '.join(tables)}"
+                elif not re.search(rf"\b{index}\b", plan):
+                    problem = f"{index} is not used"
+                else:
+                    problem = None
+                yield name, plan, problem
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the main queries of every per-user viewset and fail if any of "
+        "them is not served by its index"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--email",
+            help="User whose data the queries are planned for (defaults to the first user)",
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Print every plan, not just the failing ones",
+        )
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, plan, problem in audit_plans(self._get_user(options["email"])):
+            if problem:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name}: {problem}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: ok"))
+            if problem or options["verbose_plans"]:
+                self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f"{len(failures)} queries are not served by their index")
+
+    def _get_user(self, email):
+        users = get_user_model().objects.order_by("pk")
+        user = users.filter(email=email).first() if email else users.first()
+        if user is None:
+            raise CommandError("No user to audit queries for")
+        return user
@@ -0,0 +1,73 @@
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from pft.authentication import ClaimsTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the latency of an endpoint of a running server under concurrent "
+        "requests, e.g. with and without DATABASE_POOL to compare the two"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", required=True, help="User the requests are made as")
+        parser.add_argument("--base-url", default="http://localhost:8000")
+        parser.add_argument("--path", default="/api/v1/categories/")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=200,
+            help="Requests in flight at any time",
+        )
+        parser.add_argument("--requests", type=int, default=2000, help="Requests in total")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Seconds per request")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email=options["email"])
+        except get_user_model().DoesNotExist as e:
+            raise CommandError(f"No user with the email {options['email']}") from e
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        headers = {"Authorization": f"Bearer {token}"}
+        base_url = options["base_url"].rstrip("/")
+
+        def fetch(path):
+            request = urllib.request.Request(base_url + path, headers=headers)
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=options["timeout"]) as response:
+                    body = response.read()
+            except (URLError, OSError):
+                body = None
+            return time.perf_counter() - start, body
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(fetch, [options["path"]] * options["requests"]))
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(seconds * 1000 for seconds, body in results if body is not None)
+        errors = len(results) - len(latencies)
+        self.stdout.write(
+            f"{len(results)} requests, {options['concurrency']} concurrent: "
+            f"{len(results) / elapsed:.0f} req/s, {errors} failed"
+        )
+        if len(latencies) > 1:
+            percentiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f"latency ms: p50 {percentiles[49]:.1f}  p90 {percentiles[89]:.1f}  "
+                f"p99 {percentiles[98]:.1f}  max {latencies[-1]:.1f}"
+            )
+
+        if user.is_staff:
+            _, body = fetch("/api/v1/db/pool/stats/")
+            if body is not None:
+                self.stdout.write(f"pool: {json.dumps(json.loads(body), indent=2)}")
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from pft.models import AnalyticsReport
+from pft.reports import superseded_reports
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete generated analytics reports that a newer generation of the "
+        "same period has superseded"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=float,
+            default=1.0,
+            help="Only delete reports created more than this many days ago, so "
+                 "clients still polling a finished job can read its report",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of reports deleted per DELETE",
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["older_than"])
+        reports = superseded_reports(before).order_by("pk").values_list("pk", flat=True)
+        deleted = 0
+        while True:
+            batch = list(reports[:options["batch_size"]])
+            if not batch:
+                break
+            count, _ = AnalyticsReport.objects.filter(pk__in=batch).delete()
+            deleted += count
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} superseded reports"))
@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pft.bills import process_chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark overdue bill reminders, create the next occurrence of recurring "
+        "ones and send due notifications, for all users. Any number of "
+        "workers can run side by side"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.PFT_BILL_PROCESSING_CHUNK_SIZE,
+            help="Number of reminders claimed and processed per transaction",
+        )
+        parser.add_argument(
+            "--notice-days",
+            type=int,
+            default=settings.PFT_BILL_NOTICE_DAYS,
+            help="Days before its due date a reminder notification is sent",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running, starting a new pass this many seconds after "
+                 "the previous one finished",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = 0
+            while count := process_chunk(
+                notice_days=options["notice_days"], size=options["chunk_size"]
+            ):
+                processed += count
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} bill reminders"))
+            if options["interval"] is None:
+                break
+            time.sleep(options["interval"])
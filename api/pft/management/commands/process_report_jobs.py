@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pft.reports import process_next_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Work through the queued report jobs. Any number of workers can run "
+        "side by side; each job is claimed by exactly one of them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit as soon as the queue is empty instead of waiting for new jobs",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before polling an empty queue again",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            help="Exit after processing this many jobs",
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        while options["max_jobs"] is None or processed < options["max_jobs"]:
+            job = process_next_job()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            processed += 1
+            if job.status == "completed":
+                self.stdout.write(f"Job {job.pk}: report {job.report_id}")
+            else:
+                self.stdout.write(self.style.ERROR(f"Job {job.pk} failed: {job.error}"))
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} report jobs"))
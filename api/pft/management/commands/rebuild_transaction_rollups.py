@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from pft.models import TransactionRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-user monthly transaction rollups from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rollup rows written per INSERT",
+        )
+
+    def handle(self, *args, **options):
+        count = TransactionRollup.objects.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rollup rows"))
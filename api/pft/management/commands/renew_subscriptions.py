@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pft.renewals import renew_chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Charge the active auto-renewing subscriptions whose billing date has "
+        "come and move them to their next billing date. Safe to rerun and to "
+        "run on several workers at once"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.PFT_RENEWAL_CHUNK_SIZE,
+            help="Number of subscriptions claimed and renewed per transaction",
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Charge every billing period missed since the last renewal "
+                 "instead of only the current one",
+        )
+
+    def handle(self, *args, **options):
+        renewed = 0
+        while count := renew_chunk(
+            size=options["chunk_size"], backfill=options["backfill"]
+        ):
+            renewed += count
+        self.stdout.write(self.style.SUCCESS(f"Renewed {renewed} subscriptions"))
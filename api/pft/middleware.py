@@ -0,0 +1,110 @@
+"""
+Request instrumentation: Server-Timing headers and one structured log line
+per request, with the slowest and the repeated SQL statements of the
+requests over the PFT_SLOW_REQUEST_* thresholds.
+"""
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import instrumentation
+
+logger = logging.getLogger('pft.requests')
+
+
+class RequestTimingMiddleware:
+    """
+    Measures the request from here on: list it first in MIDDLEWARE. The
+    body of a streaming response (the transaction export) is produced after
+    the request is reported and is not counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token = instrumentation.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.stop(token)
+        self.report(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics, token = instrumentation.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.stop(token)
+        self.report(request, response, metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = instrumentation.current()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after this: rendering is not view time
+        metrics = instrumentation.current()
+        if metrics is not None:
+            metrics.view_finished = time.perf_counter()
+        return response
+
+    def report(self, request, response, metrics):
+        finished = time.perf_counter()
+        total_ms = (finished - metrics.started) * 1000
+        slow = (
+            total_ms >= settings.PFT_SLOW_REQUEST_MS
+            or metrics.queries >= settings.PFT_SLOW_REQUEST_QUERIES
+        )
+
+        timings = {
+            'db': metrics.db_time * 1000,
+            'serializer': metrics.serializer_time * 1000,
+        }
+        if metrics.view_started is not None:
+            timings['view'] = ((metrics.view_finished or finished) - metrics.view_started) * 1000
+        timings['total'] = total_ms
+
+        server_timing = settings.PFT_SERVER_TIMING
+        if server_timing is None:
+            server_timing = settings.DEBUG
+        if server_timing:
+            entries = [
+                f'{name};dur={ms:.1f}' + (f';desc="{metrics.queries} queries"' if name == 'db' else '')
+                for name, ms in timings.items()
+            ]
+            if response.has_header('Server-Timing'):
+                entries.insert(0, response['Server-Timing'])
+            response['Server-Timing'] = ', '.join(entries)
+
+        level = logging.WARNING if slow else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        match = request.resolver_match
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            **{f'{name}_ms': round(ms, 2) for name, ms in timings.items()},
+        }
+        if slow:
+            entry.update(
+                slow=True,
+                slowest_queries=metrics.slowest_statements(settings.PFT_SLOW_REQUEST_TOP_QUERIES),
+                repeated_queries=metrics.repeated_statements(settings.PFT_REPEATED_QUERY_THRESHOLD),
+            )
+        logger.log(level, json.dumps(entry))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def populate_rollups(apps, schema_editor):
+    Transaction = apps.get_model('pft', 'Transaction')
+    TransactionRollup = apps.get_model('pft', 'TransactionRollup')
+    rows = (
+        Transaction.objects.annotate(
+            year=ExtractYear('transaction_date'),
+            month=ExtractMonth('transaction_date'),
+        )
+        .values('user_id', 'year', 'month', 'category_id', 'type')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+    TransactionRollup.objects.bulk_create(
+        (TransactionRollup(**row) for row in rows.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0002_subscriptionplan_analyticsreport_billreminder_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('type', models.CharField(choices=[('income', 'Income'), ('expense', 'Expense')], max_length=10)),
+                ('total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('count', models.PositiveIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='pft.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transaction_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'year', 'month', 'category', 'type'), name='unique_transaction_rollup_bucket', nulls_distinct=False)],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
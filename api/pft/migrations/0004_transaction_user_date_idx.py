@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0003_transactionrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', '-transaction_date', '-id'], name='transaction_user_date_idx'),
+        ),
+    ]
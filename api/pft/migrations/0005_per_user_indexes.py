@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0004_transaction_user_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='analyticsreport',
+            index=models.Index(fields=['user', '-created_at'], name='report_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billreminder',
+            index=models.Index(fields=['user', 'due_date'], name='bill_user_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billreminder',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['user', 'due_date'], name='bill_pending_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='budget',
+            index=models.Index(fields=['user', '-year', '-month'], name='budget_user_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['user', 'name'], name='category_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debtaccount',
+            index=models.Index(fields=['user', 'due_date'], name='debt_user_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debtpayment',
+            index=models.Index(fields=['debt_account', '-payment_date'], name='payment_account_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(fields=['user', '-created_at'], name='investment_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentvalue',
+            index=models.Index(fields=['investment', '-date'], name='investment_value_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savingsgoal',
+            index=models.Index(fields=['user', '-created_at'], name='goal_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['user', '-created_at'], name='subscription_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['user', 'next_billing_date'], name='subscription_active_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:08
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_current_value(apps, schema_editor):
+    Investment = apps.get_model('pft', 'Investment')
+    InvestmentValue = apps.get_model('pft', 'InvestmentValue')
+    latest = InvestmentValue.objects.filter(
+        investment=OuterRef('pk')
+    ).order_by('-date', '-id')
+    Investment.objects.update(
+        current_value=Subquery(latest.values('value')[:1]),
+        current_value_date=Subquery(latest.values('date')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0005_per_user_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='investment',
+            name='current_value',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='investment',
+            name='current_value_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_current_value, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0006_investment_current_value'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='budget',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='debtpayment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
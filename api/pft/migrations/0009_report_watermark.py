@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0008_reportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticsreport',
+            name='watermark',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='analyticsreport',
+            constraint=models.UniqueConstraint(fields=('user', 'report_type', 'start_date', 'end_date', 'watermark'), name='unique_report_watermark'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0009_report_watermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='billreminder',
+            name='next_occurrence',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='previous_occurrence', to='pft.billreminder'),
+        ),
+        migrations.AddIndex(
+            model_name='billreminder',
+            index=models.Index(condition=models.Q(('status', 'pending'), models.Q(models.Q(('recurrence', 'once'), _negated=True), ('next_occurrence__isnull', True)), _connector='OR'), fields=['due_date'], name='bill_processing_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0010_bill_processing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='subscription',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions', to='pft.subscription'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(condition=models.Q(('auto_renewal', True), ('status', 'active')), fields=['next_billing_date'], name='subscription_renewal_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='transaction',
+            constraint=models.UniqueConstraint(fields=('subscription', 'transaction_date'), name='unique_subscription_charge'),
+        ),
+    ]
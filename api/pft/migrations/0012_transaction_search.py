@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    Fuzzy title matching needs pg_trgm, which ships with the Postgres contrib
+    modules (and is a trusted extension, so the database owner may install
+    it). Where it is not available search still works, without fuzzy matches.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS transaction_title_trgm_idx "
+        "ON pft_transaction USING gin (title gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS transaction_title_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0011_subscription_renewals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('title', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='transaction_search_idx'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:43
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def rename_duplicate_categories(apps, schema_editor):
+    """
+    Names were only checked for uniqueness before insert, so concurrent
+    requests may have created duplicates: number all but the oldest one.
+    """
+    Category = apps.get_model('pft', 'Category')
+    duplicates = (
+        Category.objects.values('user', 'name')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    for duplicate in duplicates:
+        taken = set(
+            Category.objects.filter(user=duplicate['user']).values_list('name', flat=True)
+        )
+        categories = Category.objects.filter(
+            user=duplicate['user'], name=duplicate['name']
+        ).order_by('id')[1:]
+        base = duplicate['name'][:90]  # room for the number in max_length
+        number = 1
+        for category in categories:
+            while f"{base} ({number})" in taken:
+                number += 1
+            category.name = f"{base} ({number})"
+            taken.add(category.name)
+            category.save(update_fields=['name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0012_transaction_search'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='category',
+            name='category_user_name_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='budget',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='budget',
+            constraint=models.UniqueConstraint(fields=('user', 'category', 'month', 'year'), name='unique_budget_period'),
+        ),
+        migrations.RunPython(rename_duplicate_categories, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='unique_category_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('name',), name='unique_shared_category_name'),
+        ),
+    ]
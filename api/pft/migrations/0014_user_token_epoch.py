@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pft', '0013_unique_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_epoch',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,7 +1,16 @@
-from django.db import models
+import calendar
+import datetime
+
+from django.db import connections, models, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.contrib.auth.base_user import BaseUserManager
 
+from .cache import bump_data_version
+
 
 
 class CustomUserManager(BaseUserManager):
@@ -60,6 +69,8 @@ class User(AbstractUser):
     bio = models.TextField(blank=True)
     department = models.CharField(max_length=20, choices=DEPARTMENT_CHOICES, default='other')
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='employee')
+    # Carried in the JWT claims; bumped to revoke every token issued before
+    token_epoch = models.PositiveIntegerField(default=0, editable=False)
 
     objects = CustomUserManager()
 
@@ -69,6 +80,30 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        if getattr(self, '_from_claims', False):
+            # Saving would write the token's copy of the email, role,
+            # department and active flag back, undoing changes made since
+            raise ValueError(
+                "A user built from token claims cannot be saved: load it from the database"
+            )
+        # set_password() leaves the raw password behind until saved
+        if self._password is not None and not self._state.adding:
+            self.token_epoch += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_epoch'}
+        super().save(*args, **kwargs)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # A user built from token claims (see pft/authentication.py) has all
+        # other fields deferred: the first one touched loads them together
+        # instead of one query per field.
+        deferred = self.get_deferred_fields()
+        if fields is not None and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using, fields, from_queryset)
+
 
 # CATEGORY MODEL
 class Category(models.Model):
@@ -79,13 +114,115 @@ class Category(models.Model):
 
     name = models.CharField(max_length=100)
     type = models.CharField(max_length=10, choices=TYPE_CHOICES)
-    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    # The user_id lookups of this model and the ones below are served by
+    # their composite indexes leading with user: no single-column index
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, db_index=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # Also the (user, name) lookup index
+            models.UniqueConstraint(
+                fields=["user", "name"], name="unique_category_name"
+            ),
+            # NULLs are distinct in the constraint above
+            models.UniqueConstraint(
+                fields=["name"],
+                condition=Q(user__isnull=True),
+                name="unique_shared_category_name",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.type})"
 
 
+def month_bounds(year, month):
+    """Return the [first day, first day of next month) range of a calendar month."""
+    start = datetime.date(year, month, 1)
+    end = datetime.date(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
+def add_months(date, months):
+    """Move a date by whole months, clamping the day to the length of the target month."""
+    year, month = divmod(date.year * 12 + date.month - 1 + months, 12)
+    month += 1
+    return date.replace(
+        year=year, month=month, day=min(date.day, calendar.monthrange(year, month)[1])
+    )
+
+
 # TRANSACTION MODEL
+class TransactionQuerySet(models.QuerySet):
+    """
+    Keeps TransactionRollup in sync for the bulk write paths, which bypass
+    Transaction.save() and Transaction.delete().
+    """
+    ROLLUP_FIELDS = {
+        "user", "user_id", "amount", "type", "category", "category_id",
+        "transaction_date",
+    }
+
+    def rollup_buckets(self):
+        return set(
+            self.annotate(
+                year=ExtractYear("transaction_date"),
+                month=ExtractMonth("transaction_date"),
+            )
+            .values_list("user_id", "year", "month")
+            .order_by()
+            .distinct()
+        )
+
+    def bulk_create(self, objs, *args, refresh_rollups=True, **kwargs):
+        """
+        Pass refresh_rollups=False when inserting many batches in one
+        database transaction and refresh the touched buckets once at the end.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            if refresh_rollups:
+                TransactionRollup.objects.refresh({obj.rollup_bucket for obj in objs})
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if self.ROLLUP_FIELDS.isdisjoint(fields):
+            # No rollup to refresh, which would have bumped the data version
+            bump_data_version(*{obj.user_id for obj in objs})
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            buckets = self.filter(pk__in=[obj.pk for obj in objs]).rollup_buckets()
+            rows = super().bulk_update(objs, fields, *args, **kwargs)
+            TransactionRollup.objects.refresh(buckets | {obj.rollup_bucket for obj in objs})
+        return rows
+
+    def update(self, **kwargs):
+        if self.ROLLUP_FIELDS.isdisjoint(kwargs):
+            bump_data_version(*self.values_list("user_id", flat=True).order_by().distinct())
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            pks = list(self.values_list("pk", flat=True))
+            buckets = self.rollup_buckets()
+            rows = super().update(**kwargs)
+            buckets |= self.model.objects.filter(pk__in=pks).rollup_buckets()
+            TransactionRollup.objects.refresh(buckets)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db, savepoint=False):
+            buckets = self.rollup_buckets()
+            deleted = super().delete()
+            TransactionRollup.objects.refresh(buckets)
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 class Transaction(models.Model):
     TYPE_CHOICES = (
         ("income", "Income"),
@@ -93,7 +230,7 @@ class Transaction(models.Model):
     )
 
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="transactions"
+        User, on_delete=models.CASCADE, related_name="transactions", db_index=False
     )
     title = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
@@ -102,25 +239,219 @@ class Transaction(models.Model):
         Category, on_delete=models.SET_NULL, null=True, related_name="transactions"
     )
     transaction_date = models.DateField()
+    # The subscription a renewal charge was posted for
+    subscription = models.ForeignKey(
+        "Subscription", on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="transactions"
+    )
+    # Maintained by Postgres, so bulk writes keep it current too
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", config="simple"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TransactionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Backs keyset pagination over (transaction_date, id) per user.
+            models.Index(
+                fields=["user", "-transaction_date", "-id"],
+                name="transaction_user_date_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="transaction_search_idx"),
+        ]
+        constraints = [
+            # A subscription is charged once per billing period
+            models.UniqueConstraint(
+                fields=["subscription", "transaction_date"],
+                name="unique_subscription_charge",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.amount} ({self.type})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the bucket the row was loaded from so an update that moves
+        # it to another user or month also refreshes the old bucket.
+        loaded = {"user_id", "transaction_date"}.issubset(field_names)
+        instance._loaded_bucket = instance.rollup_bucket if loaded else None
+        return instance
+
+    @property
+    def rollup_bucket(self):
+        date = self.transaction_date
+        if isinstance(date, str):
+            date = datetime.date.fromisoformat(date)
+        return (self.user_id, date.year, date.month)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and TransactionQuerySet.ROLLUP_FIELDS.isdisjoint(
+            update_fields
+        ):
+            return super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+            buckets = {self.rollup_bucket, getattr(self, "_loaded_bucket", None)}
+            TransactionRollup.objects.refresh(buckets - {None})
+        self._loaded_bucket = self.rollup_bucket
+
+    def delete(self, *args, **kwargs):
+        bucket = self.rollup_bucket
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            deleted = super().delete(*args, **kwargs)
+            TransactionRollup.objects.refresh({bucket})
+        return deleted
+
+
+# TRANSACTION ROLLUP MODEL
+class TransactionRollupManager(models.Manager):
+    def _aggregate(self, transactions):
+        return (
+            transactions.annotate(
+                year=ExtractYear("transaction_date"),
+                month=ExtractMonth("transaction_date"),
+            )
+            .values("user_id", "year", "month", "category_id", "type")
+            .annotate(total=Sum("amount"), count=Count("id"))
+            .order_by()
+        )
+
+    def refresh(self, buckets):
+        """
+        Recompute the rollup rows of the given (user_id, year, month) buckets
+        from their transactions.
+        """
+        if not buckets:
+            return
+        rollups = Q()
+        transactions = Q()
+        for user_id, year, month in buckets:
+            start, end = month_bounds(year, month)
+            rollups |= Q(user_id=user_id, year=year, month=month)
+            transactions |= Q(
+                user_id=user_id, transaction_date__gte=start, transaction_date__lt=end
+            )
+        with transaction.atomic(using=self.db, savepoint=False):
+            # Two transactions refreshing the same bucket would both insert
+            # its rows, so refreshes are serialized per user. The ids are
+            # sorted to always take the locks in the same order.
+            with connections[self.db].cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(user_id) FROM unnest(%s::bigint[]) AS user_id",
+                    [sorted({user_id for user_id, _, _ in buckets})]
+                )
+            self.filter(rollups).delete()
+            self.bulk_create(
+                self.model(**row)
+                for row in self._aggregate(Transaction.objects.filter(transactions))
+            )
+            # Every write that moves a total ends up here, bulk paths included
+            bump_data_version(*{user_id for user_id, _, _ in buckets})
+
+    def rebuild(self, batch_size=1000):
+        """Drop every rollup row and recompute the table from scratch."""
+        with transaction.atomic(using=self.db, savepoint=False):
+            self.all().delete()
+            rows = self._aggregate(Transaction.objects.all()).iterator(
+                chunk_size=batch_size
+            )
+            return len(
+                self.bulk_create(
+                    (self.model(**row) for row in rows), batch_size=batch_size
+                )
+            )
+
+
+class TransactionRollup(models.Model):
+    """Per-user monthly totals of transactions by category and type."""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="transaction_rollups", db_index=False
+    )
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()  # 1 to 12
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, null=True, related_name="rollups"
+    )
+    type = models.CharField(max_length=10, choices=Transaction.TYPE_CHOICES)
+    total = models.DecimalField(max_digits=14, decimal_places=2)
+    count = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TransactionRollupManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "year", "month", "category", "type"],
+                name="unique_transaction_rollup_bucket",
+                nulls_distinct=False,
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.month}/{self.year} - {self.type}: {self.total}"
+
+
+class BudgetManager(models.Manager):
+    UNIQUE_FIELDS = ["user", "category", "month", "year"]
+    UPDATE_FIELDS = ["amount_limit", "updated_at"]
+
+    def upsert(self, **fields):
+        """
+        Create the budget of a (user, category, month, year), or replace the
+        limit of the existing one, with bulk_create()'s INSERT ... ON
+        CONFLICT. Returns the budget and whether it was created.
+        """
+        budget = self.model(**fields)
+        with transaction.atomic(using=self.db, savepoint=False):
+            # bulk_create() does not tell an insert from an update
+            created = not self.filter(
+                **{name: getattr(budget, name) for name in self.UNIQUE_FIELDS}
+            ).exists()
+            self.bulk_create(
+                [budget],
+                update_conflicts=True,
+                unique_fields=self.UNIQUE_FIELDS,
+                update_fields=self.UPDATE_FIELDS,
+            )
+        # bulk_create() does not send post_save
+        bump_data_version(budget.user_id)
+        return budget, created
+
 
 # BUDGET MODEL (Optional Feature)
 class Budget(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="budgets")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="budgets", db_index=False)
     category = models.ForeignKey(
         Category, on_delete=models.CASCADE, related_name="budgets"
     )
     month = models.PositiveSmallIntegerField()  # 1 to 12
     year = models.PositiveIntegerField()
     amount_limit = models.DecimalField(max_digits=12, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BudgetManager()
 
     class Meta:
-        unique_together = ("user", "category", "month", "year")  # prevent duplicates
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "category", "month", "year"], name="unique_budget_period"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-year", "-month"], name="budget_user_period_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.category.name} - {self.month}/{self.year}"
@@ -148,6 +479,13 @@ class SubscriptionPlan(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Months per renewal; custom cycles are renewed by hand
+    CYCLE_MONTHS = {
+        'monthly': 1,
+        'quarterly': 3,
+        'yearly': 12,
+    }
+
     def __str__(self):
         return f"{self.name} ({self.get_type_display()})"
 
@@ -159,7 +497,7 @@ class Subscription(models.Model):
         ('on_hold', 'On Hold'),
     )
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='subscriptions')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='subscriptions', db_index=False)
     plan = models.ForeignKey(SubscriptionPlan, on_delete=models.CASCADE)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     start_date = models.DateField()
@@ -176,29 +514,107 @@ class Subscription(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='subscription_user_created_idx'),
+            # upcoming_renewals / statistics only look at active subscriptions
+            models.Index(
+                fields=['user', 'next_billing_date'],
+                name='subscription_active_idx',
+                condition=models.Q(status='active'),
+            ),
+            # The renewal job's due subscriptions
+            models.Index(
+                fields=['next_billing_date'],
+                name='subscription_renewal_idx',
+                condition=models.Q(status='active', auto_renewal=True),
+            ),
+        ]
+
+
+REPORT_TYPE_CHOICES = [
+    ('monthly', 'Monthly Summary'),
+    ('category', 'Category Analysis'),
+    ('trend', 'Spending Trends')
+]
 
 
 class AnalyticsReport(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='analytics_reports')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='analytics_reports', db_index=False)
     start_date = models.DateField()
     end_date = models.DateField()
-    report_type = models.CharField(max_length=20, choices=[
-        ('monthly', 'Monthly Summary'),
-        ('category', 'Category Analysis'),
-        ('trend', 'Spending Trends')
-    ])
+    report_type = models.CharField(max_length=20, choices=REPORT_TYPE_CHOICES)
     data = models.JSONField()
+    # Fingerprint of the data the report was generated from (see
+    # reports.data_watermark); null for reports created through the API.
+    watermark = models.CharField(max_length=32, null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='report_user_created_idx'),
+        ]
+        constraints = [
+            # A period is generated once per state of its data
+            models.UniqueConstraint(
+                fields=['user', 'report_type', 'start_date', 'end_date', 'watermark'],
+                name='unique_report_watermark',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email}'s {self.get_report_type_display()} ({self.start_date} to {self.end_date})"
 
 
+class ReportJob(models.Model):
+    """
+    A queued AnalyticsReport generation. Workers (the process_report_jobs
+    command) claim pending rows with SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='report_jobs', db_index=False)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    report_type = models.CharField(max_length=20, choices=REPORT_TYPE_CHOICES)
+    status = models.CharField(max_length=20, choices=[
+        ('pending', 'Pending'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed')
+    ], default='pending')
+    report = models.ForeignKey(
+        AnalyticsReport, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs'
+    )
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='report_job_user_created_idx'),
+            # The queue: workers take the oldest pending jobs first
+            models.Index(
+                fields=['created_at'],
+                name='report_job_pending_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
+        constraints = [
+            # At most one queued job per report, so repeated requests share it
+            models.UniqueConstraint(
+                fields=['user', 'report_type', 'start_date', 'end_date'],
+                name='unique_pending_report_job',
+                condition=models.Q(status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_report_type_display()} job for {self.user.email} ({self.status})"
+
+
 class SavingsGoal(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='savings_goals')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='savings_goals', db_index=False)
     title = models.CharField(max_length=100)
     target_amount = models.DecimalField(max_digits=12, decimal_places=2)
     current_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
@@ -213,6 +629,9 @@ class SavingsGoal(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='goal_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email}'s goal: {self.title}"
@@ -223,7 +642,7 @@ class SavingsGoal(models.Model):
 
 
 class BillReminder(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bill_reminders')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bill_reminders', db_index=False)
     title = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     due_date = models.DateField()
@@ -239,18 +658,41 @@ class BillReminder(models.Model):
         ('overdue', 'Overdue')
     ], default='pending')
     notification_sent = models.BooleanField(default=False)
+    # Set by the process_bill_reminders command once the due date of a
+    # recurring reminder is reached
+    next_occurrence = models.OneToOneField(
+        'self', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='previous_occurrence'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['due_date']
+        indexes = [
+            models.Index(fields=['user', 'due_date'], name='bill_user_due_idx'),
+            # upcoming only looks at pending reminders
+            models.Index(
+                fields=['user', 'due_date'],
+                name='bill_pending_due_idx',
+                condition=models.Q(status='pending'),
+            ),
+            # Reminders the bill processor may still have work for
+            models.Index(
+                fields=['due_date'],
+                name='bill_processing_idx',
+                condition=models.Q(status='pending') | (
+                    ~models.Q(recurrence='once') & models.Q(next_occurrence__isnull=True)
+                ),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email}'s bill: {self.title}"
 
 
 class DebtAccount(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='debt_accounts')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='debt_accounts', db_index=False)
     name = models.CharField(max_length=100)
     balance = models.DecimalField(max_digits=12, decimal_places=2)
     interest_rate = models.DecimalField(max_digits=5, decimal_places=2)
@@ -271,28 +713,37 @@ class DebtAccount(models.Model):
 
     class Meta:
         ordering = ['due_date']
+        indexes = [
+            models.Index(fields=['user', 'due_date'], name='debt_user_due_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email}'s {self.get_account_type_display()}: {self.name}"
 
 
 class DebtPayment(models.Model):
-    debt_account = models.ForeignKey(DebtAccount, on_delete=models.CASCADE, related_name='payments')
+    debt_account = models.ForeignKey(
+        DebtAccount, on_delete=models.CASCADE, related_name='payments', db_index=False
+    )
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     payment_date = models.DateField()
     transaction = models.ForeignKey(Transaction, on_delete=models.SET_NULL, null=True, blank=True)
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-payment_date']
+        indexes = [
+            models.Index(fields=['debt_account', '-payment_date'], name='payment_account_date_idx'),
+        ]
 
     def __str__(self):
         return f"Payment of {self.amount} for {self.debt_account.name}"
 
 
 class Investment(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='investments')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='investments', db_index=False)
     name = models.CharField(max_length=100)
     symbol = models.CharField(max_length=10, blank=True)
     type = models.CharField(max_length=20, choices=[
@@ -307,18 +758,43 @@ class Investment(models.Model):
     quantity = models.DecimalField(max_digits=12, decimal_places=4)
     purchase_date = models.DateField()
     notes = models.TextField(blank=True)
+    # Latest InvestmentValue, denormalized so lists and summaries never have
+    # to look at the value history.
+    current_value = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    current_value_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='investment_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email}'s investment: {self.name}"
 
+    def record_value(self, date, value):
+        """Add a point to the value history, moving current_value if it is the latest."""
+        investment_value = self.values.create(date=date, value=value)
+        if self.current_value_date is None or date >= self.current_value_date:
+            self.current_value = value
+            self.current_value_date = date
+            self.save(update_fields=['current_value', 'current_value_date', 'updated_at'])
+        return investment_value
+
+    def refresh_current_value(self):
+        """Re-read current_value from the value history, e.g. after it was edited."""
+        latest = self.values.order_by('-date', '-id').first()
+        self.current_value = latest.value if latest else None
+        self.current_value_date = latest.date if latest else None
+        self.save(update_fields=['current_value', 'current_value_date', 'updated_at'])
+
 
 class InvestmentValue(models.Model):
-    investment = models.ForeignKey(Investment, on_delete=models.CASCADE, related_name='values')
+    investment = models.ForeignKey(
+        Investment, on_delete=models.CASCADE, related_name='values', db_index=False
+    )
     date = models.DateField()
     value = models.DecimalField(max_digits=12, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -326,6 +802,9 @@ class InvestmentValue(models.Model):
     class Meta:
         ordering = ['-date']
         get_latest_by = 'date'
+        indexes = [
+            models.Index(fields=['investment', '-date'], name='investment_value_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.investment.name} value on {self.date}"
@@ -0,0 +1,4 @@
+"""
+The Postgres backend of the project: Django's, plus metrics on its optional
+psycopg connection pool (DATABASE_POOL in the settings).
+"""
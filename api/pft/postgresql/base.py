@@ -0,0 +1,82 @@
+"""
+Django's Postgres backend, timing how long each pooled connection checkout
+waits so the pool can be sized from what requests actually see, and the
+statements of the requests measured by RequestTimingMiddleware.
+
+The pool and the metrics live in each server process: with several workers,
+every process reports its own.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from django.db import connections
+from django.db.backends.postgresql import base
+
+from ..instrumentation import record_query
+
+# Upper bounds, in milliseconds, of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class WaitHistogram:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record(self, wait_ms):
+        with self._lock:
+            self._counts[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+        labels = [f"<={bound}ms" for bound in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, counts, strict=True))
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # Shared by the connections of every thread, as the pools are
+    _wait_histograms = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.execute_wrappers.append(record_query)
+
+    def get_new_connection(self, conn_params):
+        if not self.pool:
+            return super().get_new_connection(conn_params)
+        start = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        self._wait_histograms.setdefault(self.alias, WaitHistogram()).record(
+            (time.perf_counter() - start) * 1000
+        )
+        return connection
+
+
+def get_pool_stats():
+    """Usage of the connection pool of every pooled database, by alias."""
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        if not isinstance(connection, DatabaseWrapper) or not connection.pool:
+            continue
+        pool = connection.pool.get_stats()
+        histogram = DatabaseWrapper._wait_histograms.get(alias, WaitHistogram())
+        stats[alias] = {
+            'min_size': pool['pool_min'],
+            'max_size': pool['pool_max'],
+            'size': pool['pool_size'],
+            'in_use': pool['pool_size'] - pool['pool_available'],
+            'idle': pool['pool_available'],
+            'waiting': pool['requests_waiting'],
+            # Counters since the pool was opened; psycopg leaves out the zeros
+            'checkouts': pool.get('requests_num', 0),
+            'queued': pool.get('requests_queued', 0),
+            'timeouts': pool.get('requests_errors', 0),
+            'wait_ms_total': pool.get('requests_wait_ms', 0),
+            'connections_opened': pool.get('connections_num', 0),
+            'connections_lost': pool.get('connections_lost', 0),
+            'wait_ms_histogram': histogram.snapshot(),
+        }
+    return stats
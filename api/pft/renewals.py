@@ -0,0 +1,110 @@
+"""
+Subscription renewals, run by the renew_subscriptions command.
+
+Due subscriptions are claimed in chunks with SELECT ... FOR UPDATE SKIP
+LOCKED. Each chunk posts an expense transaction for the current billing
+period of each (or for every period that has come due, when backfilling)
+and moves next_billing_date past today in the same database transaction, so
+a rerun finds nothing left to charge.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .models import Subscription, SubscriptionPlan, Transaction, add_months
+
+
+def billing_date_after(subscription, date):
+    """
+    The first billing date after date. Billing dates are counted in whole
+    cycles from the start date, so the day of the month does not drift
+    after a short month.
+    """
+    months = SubscriptionPlan.CYCLE_MONTHS[subscription.plan.billing_cycle]
+    start = subscription.start_date
+    elapsed = (date.year - start.year) * 12 + date.month - start.month
+    cycles = max(elapsed // months, 0)
+    while (billing_date := add_months(start, cycles * months)) <= date:
+        cycles += 1
+    return billing_date
+
+
+def claim_due(today, size):
+    """
+    Lock up to size active auto-renewing subscriptions whose billing date
+    has come, skipping those held by other workers. Must be called in a
+    transaction.
+    """
+    return list(
+        Subscription.objects.select_for_update(skip_locked=True, of=('self',))
+        .select_related('plan')
+        .filter(
+            status='active',
+            auto_renewal=True,
+            next_billing_date__lte=today,
+            plan__billing_cycle__in=SubscriptionPlan.CYCLE_MONTHS
+        )
+        .order_by('next_billing_date', 'id')[:size]
+    )
+
+
+def renew_chunk(today=None, size=None, backfill=False):
+    """
+    Renew one chunk of due subscriptions in a single transaction. Returns
+    the number of subscriptions renewed, 0 once none is due.
+
+    Only the latest period that has come due is charged: a subscription
+    next billed long ago (one entered with a past start date, or not renewed
+    since) would otherwise get a transaction for every period up to today.
+    backfill=True charges all of them.
+    """
+    today = today or timezone.now().date()
+    size = size or settings.PFT_RENEWAL_CHUNK_SIZE
+    now = timezone.now()
+
+    with transaction.atomic():
+        subscriptions = claim_due(today, size)
+        if not subscriptions:
+            return 0
+
+        charges = []
+        for subscription in subscriptions:
+            due = []
+            billing_date = subscription.next_billing_date
+            while billing_date <= today and (
+                subscription.end_date is None or billing_date <= subscription.end_date
+            ):
+                due.append(billing_date)
+                billing_date = billing_date_after(subscription, billing_date)
+
+            if not backfill:
+                # The latest due date is the current period unless the
+                # subscription ended before it
+                due = due[-1:] if billing_date > today else []
+            charges.extend(
+                Transaction(
+                    user_id=subscription.user_id,
+                    subscription=subscription,
+                    title=f"{subscription.plan.name} subscription",
+                    amount=subscription.amount,
+                    type='expense',
+                    transaction_date=date
+                )
+                for date in due
+            )
+
+            subscription.next_billing_date = billing_date
+            if subscription.end_date is not None and billing_date > subscription.end_date:
+                subscription.status = 'expired'
+            subscription.updated_at = now
+
+        # A period charged before (e.g. after next_billing_date was moved
+        # back by hand) is skipped by the unique (subscription, date) constraint
+        Transaction.objects.bulk_create(charges, ignore_conflicts=True)
+        Subscription.objects.bulk_update(
+            subscriptions, ['next_billing_date', 'status', 'updated_at']
+        )
+        # bulk_update bypasses the model signals
+        bump_data_version(*{s.user_id for s in subscriptions})
+    return len(subscriptions)
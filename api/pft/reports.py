@@ -0,0 +1,162 @@
+"""
+Report generation, run by the process_report_jobs worker rather than inside
+the request that asked for the report.
+"""
+import hashlib
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, Max, OuterRef
+from django.utils import timezone
+
+from . import aggregates
+from .models import AnalyticsReport, ReportJob, TransactionRollup
+
+logger = logging.getLogger(__name__)
+
+
+def generate_monthly(user, start_date, end_date):
+    return aggregates.monthly_summary(user, start_date.year, start_date.month)
+
+
+# report_type -> function(user, start_date, end_date) returning the report data
+GENERATORS = {
+    'monthly': generate_monthly,
+}
+
+
+def data_watermark(user, start_date, end_date):
+    """
+    Fingerprint of the transactions and categories a report over the period
+    is generated from, in one aggregate query.
+
+    Every write that touches a month's transactions (bulk paths included)
+    recreates that month's TransactionRollup rows, so their latest
+    updated_at and count change with it; renaming a category moves the
+    latest category updated_at.
+    """
+    state = (
+        TransactionRollup.objects.filter(user=user)
+        .annotate(period=F('year') * 12 + F('month'))
+        .filter(period__range=(
+            start_date.year * 12 + start_date.month,
+            end_date.year * 12 + end_date.month
+        ))
+        .aggregate(
+            rollups_modified=Max('updated_at'),
+            rollups=Count('id'),
+            categories_modified=Max('category__updated_at')
+        )
+    )
+    return hashlib.md5(repr(sorted(state.items())).encode()).hexdigest()
+
+
+def find_report(user, report_type, start_date, end_date, watermark=None):
+    """The stored report of the period, if its data has not changed since."""
+    if watermark is None:
+        watermark = data_watermark(user, start_date, end_date)
+    return AnalyticsReport.objects.select_related('user').filter(
+        user=user,
+        report_type=report_type,
+        start_date=start_date,
+        end_date=end_date,
+        watermark=watermark
+    ).first()
+
+
+def enqueue_report(user, report_type, start_date, end_date):
+    """
+    Queue the generation of a report, or return the job already queued for
+    the same report.
+    """
+    if report_type not in GENERATORS:
+        raise ValueError(f"Reports of type {report_type!r} cannot be generated")
+    lookup = {
+        'user': user,
+        'report_type': report_type,
+        'start_date': start_date,
+        'end_date': end_date,
+        'status': 'pending',
+    }
+    try:
+        with transaction.atomic():
+            job, _ = ReportJob.objects.get_or_create(**lookup)
+    except IntegrityError:
+        # Queued concurrently by another request
+        job = ReportJob.objects.get(**lookup)
+    return job
+
+
+def claim_next_job():
+    """
+    Lock the oldest pending job that no other worker holds. Must be called in
+    a transaction; the lock is released, and the job handed back to the
+    queue, if the worker dies before committing.
+    """
+    return (
+        # of=('self',): locking the joined user row as well would make other
+        # workers skip every job of that user
+        ReportJob.objects.select_for_update(skip_locked=True, of=('self',))
+        .select_related('user')
+        .filter(status='pending')
+        .order_by('created_at')
+        .first()
+    )
+
+
+def run_job(job):
+    """Generate the report of a claimed job and record the outcome on it."""
+    try:
+        with transaction.atomic():
+            # Taken before generating: a write that lands in between leaves a
+            # stale watermark behind, so the next request regenerates.
+            watermark = data_watermark(job.user, job.start_date, job.end_date)
+            job.report = find_report(
+                job.user, job.report_type, job.start_date, job.end_date, watermark
+            )
+            if job.report is None:
+                data = GENERATORS[job.report_type](job.user, job.start_date, job.end_date)
+                job.report = AnalyticsReport.objects.create(
+                    user=job.user,
+                    start_date=job.start_date,
+                    end_date=job.end_date,
+                    report_type=job.report_type,
+                    data=data,
+                    watermark=watermark
+                )
+            job.status = 'completed'
+    except Exception as e:
+        logger.exception("Report job %s failed", job.pk)
+        job.status = 'failed'
+        job.error = str(e) or type(e).__name__
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def process_next_job():
+    """Claim and run one job. Returns it, or None when the queue is empty."""
+    with transaction.atomic():
+        job = claim_next_job()
+        if job is not None:
+            run_job(job)
+    return job
+
+
+def superseded_reports(before=None):
+    """
+    Generated reports for which a newer generation of the same period
+    exists. Reports created through the API are never superseded.
+    """
+    newer = AnalyticsReport.objects.filter(
+        user=OuterRef('user'),
+        report_type=OuterRef('report_type'),
+        start_date=OuterRef('start_date'),
+        end_date=OuterRef('end_date'),
+        watermark__isnull=False,
+        pk__gt=OuterRef('pk')
+    )
+    reports = AnalyticsReport.objects.filter(Exists(newer), watermark__isnull=False)
+    if before is not None:
+        reports = reports.filter(created_at__lt=before)
+    return reports
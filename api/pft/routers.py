@@ -1,7 +1,7 @@
 from rest_framework.routers import DefaultRouter
 from .views import (
     CategoryViewSet, SubscriptionPlanViewSet, SubscriptionViewSet, TransactionViewSet, BudgetViewSet,
-    AnalyticsReportViewSet, SavingsGoalViewSet, BillReminderViewSet, DebtAccountViewSet, InvestmentViewSet
+    AnalyticsReportViewSet, ReportJobViewSet, SavingsGoalViewSet, BillReminderViewSet, DebtAccountViewSet, InvestmentViewSet
 )
 
 router = DefaultRouter()
@@ -11,6 +11,7 @@ router.register("budgets", BudgetViewSet, basename="budget")
 router.register("subscriptions", SubscriptionViewSet, basename="subscription")
 router.register("subscriptionPlans", SubscriptionPlanViewSet, basename="subscriptionPlan")
 router.register("analytics", AnalyticsReportViewSet, basename="analytics")
+router.register("report-jobs", ReportJobViewSet, basename="report-job")
 router.register("savings-goals", SavingsGoalViewSet, basename="savings-goal")
 router.register("bill-reminders", BillReminderViewSet, basename="bill-reminder")
 router.register("debt-accounts", DebtAccountViewSet, basename="debt-account")
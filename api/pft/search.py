@@ -0,0 +1,70 @@
+"""
+Ranked Postgres full-text search for the transaction list, in place of DRF's
+SearchFilter and its ILIKE '%term%', which cannot use an index. The other
+lists keep SearchFilter: they hold a handful of rows per user, which the
+user filter narrows down first, and it matches parts of words.
+"""
+import re
+from functools import lru_cache
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from rest_framework import filters
+
+# No stemming or stop words: titles are merchant and product names
+SEARCH_CONFIG = 'simple'
+
+
+def search_query(terms):
+    """
+    A tsquery matching every word of the terms, or None when they hold no
+    word. Words are matched whole: prefix queries defeat the planner's
+    estimates and make it walk every row of the user instead of the GIN
+    index. Partial and misspelt words are left to the trigram match.
+    """
+    words = [word for term in terms for word in re.findall(r'\w+', term)]
+    if not words:
+        return None
+    return SearchQuery(' '.join(words), config=SEARCH_CONFIG)
+
+
+@lru_cache
+def has_trigram(using):
+    """Whether pg_trgm is installed; it is optional (see migration 0012)."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Matches the ?search= words against the model's stored, GIN-indexed
+    ``search_vector`` column and orders the results by rank.
+
+    Views may also list ``trigram_fields`` to match partial and misspelt
+    words by trigram word similarity when pg_trgm is installed.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        query = search_query(terms)
+        if query is None:
+            return queryset
+
+        matches = Q(search_vector=query)
+        rank = SearchRank(F('search_vector'), query)
+
+        trigram_fields = getattr(view, 'trigram_fields', ())
+        if trigram_fields and has_trigram(queryset.db):
+            text = ' '.join(terms)
+            for field in trigram_fields:
+                matches |= Q(**{f'{field}__trigram_word_similar': text})
+            rank = Greatest(rank, *(TrigramWordSimilarity(text, field) for field in trigram_fields))
+
+        return queryset.filter(matches).annotate(search_rank=rank).order_by('-search_rank', 'pk')
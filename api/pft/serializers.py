@@ -1,15 +1,62 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 from rest_framework import serializers
+from .instrumentation import timed
 from .models import (
     Transaction, Category, Budget, SubscriptionPlan, Subscription,
     AnalyticsReport, SavingsGoal, BillReminder, DebtAccount, DebtPayment,
-    Investment, InvestmentValue
+    Investment, InvestmentValue, ReportJob
 )
+from .timeseries import DEFAULT_POINTS, MAX_POINTS
 
 User = get_user_model()
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+def violated_constraint(error):
+    """The name of the constraint an IntegrityError was raised for, if known."""
+    return getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None)
+
+
+class TimedModelSerializer(serializers.ModelSerializer):
+    """
+    Base of the model serializers: their validation and representation are
+    the serializer time of the request (see pft/middleware.py). A list
+    serializer runs them for each child, so many=True is counted too, and a
+    nested serializer is counted with its parent.
+    """
+
+    @timed
+    def run_validation(self, *args, **kwargs):
+        return super().run_validation(*args, **kwargs)
+
+    @timed
+    def to_representation(self, *args, **kwargs):
+        return super().to_representation(*args, **kwargs)
+
+
+class ConstraintErrorsMixin:
+    """
+    Writes rely on the database constraints instead of looking for conflicts
+    with a query first. ``constraint_errors`` maps a constraint name to the
+    validation errors answered when a write violates it.
+    """
+    constraint_errors = {}
+
+    def save(self, **kwargs):
+        try:
+            # A savepoint, so that an outer transaction stays usable
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as e:
+            errors = self.constraint_errors.get(violated_constraint(e))
+            if errors is None:
+                raise
+            raise serializers.ValidationError(errors) from e
+
+
+class UserProfileSerializer(TimedModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -26,7 +73,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ("email", "role")
 
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(TimedModelSerializer):
     password = serializers.CharField(write_only=True, required=True)
     confirm_password = serializers.CharField(write_only=True, required=True)
     username = serializers.CharField(required=False)
@@ -45,6 +92,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             "bio",
             "department",
         )
+        # Uniqueness is left to the database (see create)
+        extra_kwargs = {"email": {"validators": []}}
 
     def validate(self, data):
         if not data.get("email"):
@@ -63,33 +112,38 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, validated_data):
-        return User.objects.create_user(**validated_data)
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(**validated_data)
+        except IntegrityError as e:
+            # The email, which is also the username, is taken
+            raise serializers.ValidationError(
+                {"email": ["Something went wrong. Please contact support or try again."]}
+            ) from e
 
 
-class CategorySerializer(serializers.ModelSerializer):
-    def validate_name(self, value):
-        user = self.context["request"].user
-        # Check if category with same name exists for this user
-        if Category.objects.filter(user=user, name=value).exists():
-            raise serializers.ValidationError(
-                "A category with this name already exists."
-            )
-        return value
+class CategorySerializer(ConstraintErrorsMixin, TimedModelSerializer):
+    constraint_errors = {
+        "unique_category_name": {"name": ["A category with this name already exists."]},
+    }
 
     class Meta:
         model = Category
         fields = "__all__"
         read_only_fields = ["user"]
+        # Left to the constraints, see ConstraintErrorsMixin
+        validators = []
+        extra_kwargs = {"name": {"validators": []}}
 
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionSerializer(TimedModelSerializer):
     amount = serializers.DecimalField(max_digits=12, decimal_places=2)
 
     class Meta:
         model = Transaction
         fields = ['id', 'user', 'title', 'amount', 'type', 'category', 
-                 'transaction_date', 'created_at', 'updated_at']
-        read_only_fields = ['created_at', 'updated_at']
+                 'transaction_date', 'subscription', 'created_at', 'updated_at']
+        read_only_fields = ['subscription', 'created_at', 'updated_at']
 
     def to_representation(self, instance):
         # Ensure amount is always serialized as Decimal
@@ -117,43 +171,115 @@ class TransactionSerializer(serializers.ModelSerializer):
         return instance
 
 
-class BudgetSerializer(serializers.ModelSerializer):
-    def validate(self, data):
-        user = self.context["request"].user
-        # Check if budget already exists for this user, category, month, and year
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves primary keys from a ``{pk: instance}`` map stored in the
+    serializer context under ``context_key`` instead of running one query per
+    value. Falls back to the queryset when no map was loaded.
+    """
+
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get(self.context_key)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
         try:
-            existing_budget = Budget.objects.get(
-                user=user,
-                category=data["category"],
-                month=data["month"],
-                year=data["year"],
-            )
-            
-            # If this is an update operation for this exact budget, allow it
-            if self.instance and self.instance.id == existing_budget.id:
-                return data
-                
-            # For POST requests, update the existing budget instead of creating a new one
-            if not self.instance:
-                self.instance = existing_budget
-                
-            return data
-        except Budget.DoesNotExist:
-            # No existing budget, so we can create a new one
-            return data
+            return preloaded[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class TransactionListSerializer(serializers.ListSerializer):
+    """Writes a whole list of transactions with a single bulk statement."""
+
+    def to_internal_value(self, data):
+        user = self.context['request'].user
+        self.context['categories'] = Category.objects.filter(
+            models.Q(user=user) | models.Q(user__isnull=True)
+        ).in_bulk()
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        return Transaction.objects.bulk_create(
+            [Transaction(**attrs) for attrs in validated_data]
+        )
+
+    def update(self, instances, validated_data):
+        # bulk_update() does not go through auto_now, so stamp it here.
+        now = timezone.now()
+        fields = {'updated_at'}
+        for instance, attrs in zip(instances, validated_data, strict=True):
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+            instance.updated_at = now
+            fields.update(attrs)
+        Transaction.objects.bulk_update(instances, fields)
+        return instances
+
+
+class TransactionBatchSerializer(TransactionSerializer):
+    """A transaction inside a batch request; always owned by the requesting user."""
+    category = PreloadedPrimaryKeyRelatedField(
+        'categories', queryset=Category.objects.all(), allow_null=True, required=False
+    )
+
+    class Meta(TransactionSerializer.Meta):
+        read_only_fields = ['user', 'subscription', 'created_at', 'updated_at']
+        list_serializer_class = TransactionListSerializer
+
+
+class TransactionBatchDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.PFT_BATCH_MAX_SIZE,
+    )
+
+
+class BudgetSerializer(ConstraintErrorsMixin, TimedModelSerializer):
+    constraint_errors = {
+        "unique_budget_period": {
+            "non_field_errors": ["A budget for this category and month already exists."]
+        },
+    }
 
     class Meta:
         model = Budget
         fields = "__all__"
         read_only_fields = ["user"]
 
+    def create(self, validated_data):
+        # Posting the budget of an existing category and month replaces its limit
+        budget, self.created = Budget.objects.upsert(**validated_data)
+        return budget
+
+
+class BudgetUtilizationQuerySerializer(serializers.Serializer):
+    year = serializers.IntegerField(required=False, min_value=1)
+    month = serializers.IntegerField(required=False, min_value=1, max_value=12)
+
+    def validate(self, data):
+        # Without a period, the current month
+        if 'year' not in data:
+            today = timezone.now().date()
+            data['year'] = today.year
+            data.setdefault('month', today.month)
+        return data
+
 
-class SubscriptionPlanSerializer(serializers.ModelSerializer):
+class SubscriptionPlanSerializer(TimedModelSerializer):
     class Meta:
         model = SubscriptionPlan
         fields = '__all__'
 
-class SubscriptionSerializer(serializers.ModelSerializer):
+class SubscriptionSerializer(TimedModelSerializer):
     plan_details = SubscriptionPlanSerializer(source='plan', read_only=True)
     user_email = serializers.EmailField(source='user.email', read_only=True)
 
@@ -183,14 +309,14 @@ class SubscriptionSerializer(serializers.ModelSerializer):
         return data
 
 
-class AnalyticsReportSerializer(serializers.ModelSerializer):
+class AnalyticsReportSerializer(TimedModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
 
     class Meta:
         model = AnalyticsReport
         fields = ['id', 'user', 'user_email', 'start_date', 'end_date', 
-                 'report_type', 'data', 'created_at']
-        read_only_fields = ['created_at']
+                 'report_type', 'data', 'created_at', 'updated_at']
+        read_only_fields = ['created_at', 'updated_at']
 
     def validate(self, data):
         if data['start_date'] > data['end_date']:
@@ -198,7 +324,17 @@ class AnalyticsReportSerializer(serializers.ModelSerializer):
         return data
 
 
-class SavingsGoalSerializer(serializers.ModelSerializer):
+class ReportJobSerializer(TimedModelSerializer):
+    report = AnalyticsReportSerializer(read_only=True)
+
+    class Meta:
+        model = ReportJob
+        fields = ['id', 'report_type', 'start_date', 'end_date', 'status',
+                 'report', 'error', 'created_at', 'updated_at', 'finished_at']
+        read_only_fields = fields
+
+
+class SavingsGoalSerializer(TimedModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
     progress_percentage = serializers.FloatField(read_only=True)
 
@@ -217,14 +353,15 @@ class SavingsGoalSerializer(serializers.ModelSerializer):
         return data
 
 
-class BillReminderSerializer(serializers.ModelSerializer):
+class BillReminderSerializer(TimedModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
 
     class Meta:
         model = BillReminder
         fields = ['id', 'user', 'user_email', 'title', 'amount', 'due_date',
-                 'recurrence', 'status', 'notification_sent', 'created_at', 'updated_at']
-        read_only_fields = ['created_at', 'updated_at', 'notification_sent']
+                 'recurrence', 'status', 'notification_sent', 'next_occurrence',
+                 'created_at', 'updated_at']
+        read_only_fields = ['created_at', 'updated_at', 'notification_sent', 'next_occurrence']
 
     def validate(self, data):
         if data.get('amount', 0) <= 0:
@@ -232,14 +369,14 @@ class BillReminderSerializer(serializers.ModelSerializer):
         return data
 
 
-class DebtPaymentSerializer(serializers.ModelSerializer):
+class DebtPaymentSerializer(TimedModelSerializer):
     transaction_details = TransactionSerializer(source='transaction', read_only=True)
 
     class Meta:
         model = DebtPayment
         fields = ['id', 'debt_account', 'amount', 'payment_date', 
-                 'transaction', 'transaction_details', 'notes', 'created_at']
-        read_only_fields = ['created_at']
+                 'transaction', 'transaction_details', 'notes', 'created_at', 'updated_at']
+        read_only_fields = ['created_at', 'updated_at']
 
     def validate_amount(self, value):
         if value <= 0:
@@ -247,15 +384,20 @@ class DebtPaymentSerializer(serializers.ModelSerializer):
         return value
 
 
-class DebtAccountSerializer(serializers.ModelSerializer):
+class DebtAccountSerializer(TimedModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
-    payments = DebtPaymentSerializer(many=True, read_only=True)
+    # Annotated by DebtAccountViewSet.get_queryset; the payments themselves
+    # are served paginated from debt-accounts/{id}/payments/
+    payments_count = serializers.IntegerField(read_only=True)
+    total_paid = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    last_payment_date = serializers.DateField(read_only=True)
 
     class Meta:
         model = DebtAccount
         fields = ['id', 'user', 'user_email', 'name', 'balance', 'interest_rate',
                  'minimum_payment', 'due_date', 'account_type', 'status', 
-                 'payments', 'created_at', 'updated_at']
+                 'payments_count', 'total_paid', 'last_payment_date',
+                 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
 
     def validate(self, data):
@@ -268,7 +410,23 @@ class DebtAccountSerializer(serializers.ModelSerializer):
         return data
 
 
-class InvestmentValueSerializer(serializers.ModelSerializer):
+class InvestmentHistoryQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False, default=lambda: timezone.now().date())
+    points = serializers.IntegerField(required=False, default=DEFAULT_POINTS, min_value=1, max_value=MAX_POINTS)
+
+    def validate(self, data):
+        if data.get('start') and data['start'] > data['end']:
+            raise serializers.ValidationError("Start date must be before end date")
+        return data
+
+
+class TimeSeriesPointSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    value = serializers.DecimalField(max_digits=16, decimal_places=2)
+
+
+class InvestmentValueSerializer(TimedModelSerializer):
     class Meta:
         model = InvestmentValue
         fields = ['id', 'date', 'value', 'created_at']
@@ -280,21 +438,15 @@ class InvestmentValueSerializer(serializers.ModelSerializer):
         return value
 
 
-class InvestmentSerializer(serializers.ModelSerializer):
+class InvestmentSerializer(TimedModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
-    values = InvestmentValueSerializer(many=True, read_only=True)
-    current_value = serializers.SerializerMethodField()
 
     class Meta:
         model = Investment
         fields = ['id', 'user', 'user_email', 'name', 'symbol', 'type',
                  'purchase_price', 'quantity', 'purchase_date', 'notes',
-                 'values', 'current_value', 'created_at', 'updated_at']
-        read_only_fields = ['created_at', 'updated_at']
-
-    def get_current_value(self, obj):
-        latest_value = obj.values.first()
-        return latest_value.value if latest_value else None
+                 'current_value', 'current_value_date', 'created_at', 'updated_at']
+        read_only_fields = ['current_value', 'current_value_date', 'created_at', 'updated_at']
 
     def validate(self, data):
         if data.get('purchase_price', 0) <= 0:
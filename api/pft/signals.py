@@ -1,7 +1,16 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.db.models import QuerySet
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Category
+from django.core.cache import cache
+from django.db import transaction
+from .authentication import TOKEN_STATE_KEY
+from .cache import bump_data_version
+from .models import (
+    Budget, Category, Transaction, SubscriptionPlan, Subscription,
+    SavingsGoal, BillReminder, DebtAccount, DebtPayment, Investment,
+    InvestmentValue, TransactionRollup
+)
 
 User = get_user_model()
 
@@ -24,3 +33,72 @@ def create_default_categories(sender, instance, created, **kwargs):
             type="expense",
             user=instance
         )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_token_state(sender, instance, **kwargs):
+    """
+    Drop the cached token epoch and active flag once the change is committed,
+    so revoking tokens or deactivating the user takes effect right away.
+    """
+    key = TOKEN_STATE_KEY.format(instance.pk)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(pre_delete, sender=Category)
+def collect_category_rollup_buckets(sender, instance, origin=None, **kwargs):
+    """
+    Deleting a category moves its transactions to "uncategorized" through a
+    bulk SET NULL, so remember which rollup buckets need recomputing. When the
+    category goes away with its user the rollups are cascaded anyway.
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is Category:
+        instance._rollup_buckets = instance.transactions.rollup_buckets()
+
+
+@receiver(post_delete, sender=Category)
+def refresh_category_rollup_buckets(sender, instance, **kwargs):
+    TransactionRollup.objects.refresh(getattr(instance, "_rollup_buckets", set()))
+
+
+
+# Models whose writes change what the cached read endpoints return, with the
+# user that owns them (None for data shared by everyone). AnalyticsReport is
+# left out as reports are written by reads.
+DATA_VERSION_OWNERS = {
+    Category: lambda instance: instance.user_id,
+    Transaction: lambda instance: instance.user_id,
+    Budget: lambda instance: instance.user_id,
+    SubscriptionPlan: lambda instance: None,
+    Subscription: lambda instance: instance.user_id,
+    SavingsGoal: lambda instance: instance.user_id,
+    BillReminder: lambda instance: instance.user_id,
+    DebtAccount: lambda instance: instance.user_id,
+    DebtPayment: lambda instance: instance.debt_account.user_id,
+    Investment: lambda instance: instance.user_id,
+    InvestmentValue: lambda instance: instance.investment.user_id,
+}
+
+
+def bump_data_version_on_save(sender, instance, **kwargs):
+    bump_data_version(DATA_VERSION_OWNERS[sender](instance))
+
+
+def bump_data_version_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Rows deleted in cascade are covered by their parent's own post_delete,
+    so only the row (or queryset) the delete started from bumps the version.
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is sender:
+        bump_data_version(DATA_VERSION_OWNERS[sender](instance))
+
+
+for model in DATA_VERSION_OWNERS:
+    post_save.connect(bump_data_version_on_save, sender=model)
+    # A post_delete receiver stops Django from fast-deleting a model, so leave
+    # the history rows alone: they are only ever deleted with their parent.
+    if model not in (DebtPayment, InvestmentValue):
+        post_delete.connect(bump_data_version_on_delete, sender=model)
@@ -0,0 +1,73 @@
+import datetime
+import threading
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from pft import async_views
+from pft.authentication import ClaimsTokenObtainPairSerializer
+from pft.models import Investment, Subscription, SubscriptionPlan, User
+
+
+class DashboardTests(TransactionTestCase):
+    # The aggregates run on worker threads with connections of their own,
+    # which only see committed rows
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="dashboard@example.com", username="dashboard")
+        Investment.objects.create(
+            user=self.user, name="Index fund", type="stocks", purchase_price=Decimal("10.00"),
+            quantity=Decimal("2"), purchase_date=datetime.date(2024, 1, 1)
+        )
+        Subscription.objects.create(
+            user=self.user, plan=SubscriptionPlan.objects.create(name="Netflix"),
+            amount=Decimal("15.49"), start_date=datetime.date(2025, 1, 1)
+        )
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def worker_connections(self):
+        """Number of aggregate workers still holding a database connection."""
+        workers = settings.PFT_ASYNC_DB_WORKERS
+        # Every worker waits for the others, so each one answers once
+        barrier = threading.Barrier(workers)
+
+        def connected():
+            barrier.wait(timeout=10)
+            return connections["default"].connection is not None
+
+        return sum(f.result() for f in [async_views._executor.submit(connected) for _ in range(workers)])
+
+    def test_requires_a_token(self):
+        self.assertEqual(self.client.get(reverse("pft:dashboard")).status_code, 401)
+
+    def test_dashboard_gathers_the_summaries(self):
+        response = self.client.get(reverse("pft:dashboard"), headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.json()),
+            {"portfolio", "subscriptions", "monthly_summary", "upcoming_bills", "debts"}
+        )
+        self.assertEqual(self.client.post(reverse("pft:dashboard"), headers=self.headers).status_code, 405)
+
+    def test_summaries_match_the_drf_endpoints(self):
+        for async_name, drf_name in (
+            ("pft:dashboard-portfolio-summary", "pft:investment-portfolio-summary"),
+            ("pft:dashboard-subscription-statistics", "pft:subscription-statistics"),
+        ):
+            response = self.client.get(reverse(async_name), headers=self.headers)
+            self.assertEqual(response.json(), self.api.get(reverse(drf_name)).json())
+
+    def test_workers_close_their_connections(self):
+        for _ in range(2):
+            self.client.get(reverse("pft:dashboard"), headers=self.headers)
+            cache.clear()
+        self.assertEqual(self.worker_connections(), 0)
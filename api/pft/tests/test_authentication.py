@@ -0,0 +1,42 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from pft.authentication import ClaimsTokenObtainPairSerializer
+from pft.models import User
+
+
+class ClaimsUserTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="claims@example.com", username="claims", password="Old-passw0rd!", role="employee"
+        )
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_profile_update_keeps_changes_made_after_the_token(self):
+        User.objects.filter(pk=self.user.pk).update(role="manager", department="finance")
+        response = self.client.patch(reverse("pft:update-profile"), {"bio": "Hello"})
+        self.assertEqual(response.status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.bio, self.user.role, self.user.department), ("Hello", "manager", "finance"))
+
+    def test_password_change_saves_the_stored_user(self):
+        User.objects.filter(pk=self.user.pk).update(role="manager")
+        response = self.client.post(reverse("pft:change-password"), {
+            "current_password": "Old-passw0rd!",
+            "new_password": "New-passw0rd!",
+            "confirm_password": "New-passw0rd!",
+        })
+        self.assertEqual(response.status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("New-passw0rd!"))
+        self.assertEqual(self.user.role, "manager")
+
+    def test_claims_user_cannot_be_saved(self):
+        response = self.client.patch(reverse("pft:update-profile"), {})
+        with self.assertRaises(ValueError):
+            response.wsgi_request.user.save()
@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from pft.models import Category, Transaction, TransactionRollup, User
+
+
+class TransactionBatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="batch@example.com", username="batch")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.groceries = Category.objects.get(user=self.user, name="Groceries")
+        self.url = reverse("pft:transaction-batch")
+
+    def rollups(self, month=3):
+        return {
+            (r.category_id, r.type): (r.total, r.count)
+            for r in TransactionRollup.objects.filter(user=self.user, year=2025, month=month)
+        }
+
+    def create(self, *amounts):
+        response = self.client.post(self.url, [
+            {"title": f"Item {i}", "amount": amount, "type": "expense",
+             "category": self.groceries.pk, "transaction_date": "2025-03-10"}
+            for i, amount in enumerate(amounts)
+        ], format="json")
+        self.assertEqual(response.status_code, 201)
+        return [item["id"] for item in response.data]
+
+    def test_create_refreshes_the_rollups(self):
+        ids = self.create("10.00", "5.50")
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(self.rollups(), {(self.groceries.pk, "expense"): (Decimal("15.50"), 2)})
+
+    def test_create_rejects_invalid_items(self):
+        other = User.objects.create_user(email="other@example.com", username="other")
+        response = self.client.post(self.url, [
+            {"title": "Fine", "amount": "1.00", "type": "expense", "transaction_date": "2025-03-10"},
+            {"title": "Theirs", "amount": "1.00", "type": "expense", "transaction_date": "2025-03-10",
+             "category": Category.objects.filter(user=other).first().pk},
+        ], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("category", response.data[1])
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_update_moves_the_rollups(self):
+        first, second = self.create("10.00", "5.50")
+        response = self.client.patch(self.url, [
+            {"id": first, "amount": "20.00"},
+            {"id": second, "transaction_date": "2025-04-01", "category": None},
+        ], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]["amount"], "20.00")
+        self.assertEqual(self.rollups(3), {(self.groceries.pk, "expense"): (Decimal("20.00"), 1)})
+        self.assertEqual(self.rollups(4), {(None, "expense"): (Decimal("5.50"), 1)})
+
+    def test_update_reports_unknown_ids(self):
+        (pk,) = self.create("10.00")
+        response = self.client.patch(self.url, [{"id": pk, "amount": "1.00"}, {"id": pk + 100}], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, [{}, {"id": ["Not found."]}])
+        self.assertEqual(Transaction.objects.get(pk=pk).amount, Decimal("10.00"))
+
+    def test_delete_empties_the_rollups(self):
+        first, second = self.create("10.00", "5.50")
+        response = self.client.delete(self.url, {"ids": [first, second, second + 100]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["deleted"], 2)
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]],
+            ["deleted", "deleted", "not_found"]
+        )
+        self.assertFalse(Transaction.objects.exists())
+        self.assertEqual(self.rollups(), {})
@@ -0,0 +1,49 @@
+import datetime
+from decimal import Decimal
+
+from django.core import mail
+from django.test import TestCase
+
+from pft.bills import next_due_date, process_chunk
+from pft.models import BillReminder, User
+
+
+class ProcessBillRemindersTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="bills@example.com", username="bills")
+        self.today = datetime.date(2025, 6, 15)
+
+    def add_reminder(self, due_date, recurrence):
+        return BillReminder.objects.create(
+            user=self.user, title="Rent", amount=Decimal("500.00"),
+            due_date=due_date, recurrence=recurrence
+        )
+
+    def process(self):
+        while process_chunk(today=self.today, notice_days=3):
+            pass
+
+    def test_missed_periods_are_skipped_without_notifications(self):
+        reminder = self.add_reminder(datetime.date(2024, 6, 12), "weekly")
+        self.process()
+
+        reminder.refresh_from_db()
+        self.assertEqual(reminder.status, "overdue")
+        self.assertEqual(reminder.next_occurrence.due_date, datetime.date(2025, 6, 18))
+        self.assertEqual(BillReminder.objects.count(), 2)
+        # The new occurrence is due within the notice days, the past ones are not sent
+        self.assertEqual([message.subject for message in mail.outbox], ["Upcoming bill: Rent"])
+
+    def test_reminder_due_in_the_last_period_is_notified(self):
+        reminder = self.add_reminder(datetime.date(2025, 6, 1), "monthly")
+        self.process()
+
+        reminder.refresh_from_db()
+        self.assertEqual(reminder.next_occurrence.due_date, datetime.date(2025, 7, 1))
+        self.assertEqual([message.subject for message in mail.outbox], ["Overdue bill: Rent"])
+
+    def test_next_due_date_keeps_the_day_of_the_month(self):
+        self.assertEqual(
+            next_due_date(datetime.date(2025, 1, 31), "monthly", on_or_after=datetime.date(2025, 3, 1)),
+            datetime.date(2025, 3, 31)
+        )
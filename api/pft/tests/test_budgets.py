@@ -0,0 +1,29 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from pft.models import Budget, Category, User
+
+
+class BudgetUpsertTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="budgets@example.com", username="budgets")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.data = {
+            "category": Category.objects.get(user=self.user, name="Groceries").pk,
+            "month": 3,
+            "year": 2025,
+            "amount_limit": "100.00",
+        }
+
+    def test_created_then_replaced(self):
+        response = self.client.post(reverse("pft:budget-list"), self.data)
+        self.assertEqual(response.status_code, 201)
+        budget_id = response.data["id"]
+
+        response = self.client.post(reverse("pft:budget-list"), self.data | {"amount_limit": "250.00"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], budget_id)
+        self.assertEqual(response.data["amount_limit"], "250.00")
+        self.assertEqual(Budget.objects.get().amount_limit, 250)
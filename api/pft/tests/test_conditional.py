@@ -0,0 +1,47 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from pft.models import Category, Transaction, User
+
+
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="etag@example.com", username="etag")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(user=self.user, name="Hobbies")
+        self.transaction = Transaction.objects.create(
+            user=self.user, title="Paint", amount=Decimal("12.00"), type="expense",
+            category=self.category, transaction_date=datetime.date(2025, 3, 10)
+        )
+        self.url = reverse("pft:transaction-list")
+
+    def test_unchanged_list_is_answered_with_one_query(self):
+        response = self.client.get(self.url)
+        self.assertIn("Last-Modified", response)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_from_another_process_changes_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        # Another process's write bumps the data versions of its own cache only
+        with mock.patch("pft.signals.bump_data_version"):
+            self.transaction.title = "Brushes"
+            self.transaction.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_category_delete_changes_the_etag(self):
+        # The transaction's category is set to NULL without a save of its own
+        etag = self.client.get(self.url)["ETag"]
+        self.category.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
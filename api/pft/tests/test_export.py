@@ -0,0 +1,34 @@
+import datetime
+from decimal import Decimal
+
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from pft.authentication import ClaimsTokenObtainPairSerializer
+from pft.models import Transaction, User
+
+
+@override_settings(PFT_EXPORT_CHUNK_SIZE=2)
+class ExportUnderASGITests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="export@example.com", username="export")
+        Transaction.objects.bulk_create(
+            Transaction(
+                user=self.user, title=f"Transaction {i}", amount=Decimal("10.00"),
+                type="expense", transaction_date=datetime.date(2025, 3, i + 1)
+            )
+            for i in range(5)
+        )
+        self.token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+
+    async def test_streams_an_async_iterator(self):
+        response = await AsyncClient().get(
+            reverse("pft:transaction-export"), headers={"Authorization": f"Bearer {self.token}"}
+        )
+        self.assertEqual(response.status_code, 200)
+        # A sync iterator would be read whole by Django before the first byte
+        self.assertTrue(response.is_async)
+        lines = b"".join([part async for part in response.streaming_content]).decode().splitlines()
+        self.assertEqual(lines[0], "id,date,title,amount,type,category")
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[1].endswith(",2025-03-05,Transaction 4,10.00,expense,"))
@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from pft.models import Category, Transaction, TransactionRollup, User
+
+OFX = b"""OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250310120000[0:GMT]<TRNAMT>-42.50<NAME>Grocer
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250325<TRNAMT>1,000.00<MEMO>Salary
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+class TransactionImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="import@example.com", username="import")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.groceries = Category.objects.get(user=self.user, name="Groceries")
+        self.url = reverse("pft:transaction-import-file")
+
+    def upload(self, name, content, **data):
+        return self.client.post(
+            self.url, {"file": SimpleUploadedFile(name, content), **data}, format="multipart"
+        )
+
+    def rollups(self):
+        return {
+            (r.category_id, r.type): (r.total, r.count)
+            for r in TransactionRollup.objects.filter(user=self.user, year=2025, month=3)
+        }
+
+    @override_settings(PFT_IMPORT_BATCH_SIZE=2)
+    def test_csv_rows_are_imported_in_batches(self):
+        response = self.upload("bank.csv", (
+            b"Date,Description,Amount,Category\n"
+            b"2025-03-01,Market,-12.00,groceries\n"
+            b"2025-03-02,Bakery,-3.50,Groceries\n"
+            b"2025-03-03,Refund,8.00,\n"
+        ))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"imported": 3, "failed": 0, "errors": []})
+        self.assertEqual(self.rollups(), {
+            (self.groceries.pk, "expense"): (Decimal("15.50"), 2),
+            (None, "income"): (Decimal("8.00"), 1),
+        })
+
+    def test_csv_error_rows_are_reported(self):
+        response = self.upload("bank.csv", (
+            b"date,title,amount,type,category\n"
+            b"2025-03-01,Market,12.00,expense,Groceries\n"
+            b"03/02/2025,,twelve,gift,Unknown\n"
+        ))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["imported"], 1)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertEqual(response.data["errors"], [{"row": 2, "errors": [
+            "Title is required.",
+            "Date must be in YYYY-MM-DD format.",
+            "Amount must be a number.",
+            'Type must be "income" or "expense".',
+            'Unknown category "Unknown".',
+        ]}])
+
+    def test_only_error_rows_import_nothing(self):
+        response = self.upload("bank.csv", b"date,title,amount\n2025-03-01,Market,\n")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_ofx_types_follow_the_amount_sign(self):
+        response = self.upload("statement.ofx", OFX)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(Transaction.objects.order_by("transaction_date").values_list("title", "amount", "type")),
+            [("Grocer", Decimal("42.50"), "expense"), ("Salary", Decimal("1000.00"), "income")]
+        )
+
+    def test_unreadable_files_are_rejected(self):
+        for name, content, data in (
+            ("bank.xls", b"", {}),
+            ("bank.csv", b"", {}),
+            ("bank.csv", b"date,title\n2025-03-01,Market\n", {}),
+            ("bank.txt", b"\xff\xfe", {"file_type": "csv"}),
+        ):
+            with self.subTest(name=name, content=content):
+                response = self.upload(name, content, **data)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.data)
+        self.assertFalse(Transaction.objects.exists())
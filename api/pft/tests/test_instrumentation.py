@@ -0,0 +1,38 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from pft import instrumentation
+from pft.models import User
+from pft.serializers import TransactionBatchSerializer
+
+
+class RequestTimingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="timing@example.com", username="timing")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_many_validation_is_serializer_time(self):
+        request = APIRequestFactory().post("/")
+        request.user = self.user
+        serializer = TransactionBatchSerializer(
+            data=[{"title": "Coffee", "amount": "3.50", "type": "expense", "transaction_date": "2025-03-01"}] * 3,
+            many=True, context={"request": request}
+        )
+        metrics, token = instrumentation.start()
+        try:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        finally:
+            instrumentation.stop(token)
+        self.assertGreater(metrics.serializer_time, 0)
+
+    def test_server_timing_follows_debug_by_default(self):
+        url = reverse("pft:category-list")
+        self.assertNotIn("Server-Timing", self.client.get(url))
+        with self.settings(DEBUG=True):
+            self.assertIn("serializer;dur=", self.client.get(url)["Server-Timing"])
+
+    @override_settings(PFT_SERVER_TIMING=True)
+    def test_server_timing_setting_wins_over_debug(self):
+        self.assertIn("db;dur=", self.client.get(reverse("pft:category-list"))["Server-Timing"])
@@ -0,0 +1,40 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+
+from pft import aggregates
+from pft.models import Category, Transaction, User
+
+
+class MonthlySummaryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="summary@example.com", username="summary")
+        self.groceries = Category.objects.get(user=self.user, name="Groceries")
+        self.date = datetime.date(2025, 3, 10)
+
+    def add_transactions(self, count):
+        for i in range(count):
+            Transaction.objects.create(
+                user=self.user,
+                title=f"Transaction {i}",
+                amount=Decimal("10.00"),
+                type="expense",
+                category=self.groceries if i % 2 else None,
+                transaction_date=self.date,
+            )
+
+    def test_constant_number_of_queries(self):
+        self.add_transactions(1)
+        with self.assertNumQueries(1):
+            aggregates.monthly_summary(self.user, 2025, 3)
+
+        self.add_transactions(25)
+        with self.assertNumQueries(1):
+            summary = aggregates.monthly_summary(self.user, 2025, 3)
+
+        self.assertEqual(summary["total_expenses"], "260.00")
+        self.assertEqual(summary["by_category"], {
+            "Groceries": {"income": "0", "expense": "120.00"},
+            "Uncategorized": {"income": "0", "expense": "140.00"},
+        })
@@ -0,0 +1,58 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from pft.models import SavingsGoal, User
+from pft.pagination import CustomPagination
+
+
+class CursorView:
+    cursor_ordering = ('-created_at', '-id')
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="pages@example.com", username="pages")
+        self.factory = APIRequestFactory()
+
+    def pages(self, queryset):
+        """The pk of every row, following the next links one row per page."""
+        paginator = CustomPagination()
+        paginator.page_size = 1
+        seen = []
+        cursor = ''
+        while cursor is not None:
+            request = Request(self.factory.get('/goals/', {'cursor': cursor}))
+            seen += [row.pk for row in paginator.paginate_queryset(queryset, request, CursorView())]
+            position = paginator.next_position
+            cursor = None if position is None else paginator.encode_cursor(position)
+        return seen
+
+    def test_rows_created_in_the_same_millisecond(self):
+        created = timezone.make_aware(datetime.datetime(2025, 1, 1, 12, 0, 0, 123000))
+        goals = []
+        for micro in (100, 200, 300):
+            goal = SavingsGoal.objects.create(
+                user=self.user, title=f"Goal {micro}", target_amount=100,
+                target_date=datetime.date(2026, 1, 1)
+            )
+            SavingsGoal.objects.filter(pk=goal.pk).update(
+                created_at=created + datetime.timedelta(microseconds=micro)
+            )
+            goals.append(goal.pk)
+
+        self.assertEqual(self.pages(SavingsGoal.objects.filter(user=self.user)), goals[::-1])
+
+    def test_cursor_with_invalid_values_is_not_found(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        encode = CustomPagination().encode_cursor
+        for position in (["notadate", 1], ["2025-01-01", "abc"], ["2025-01-01", None], ["2025-01-01"]):
+            response = client.get(reverse("pft:transaction-list"), {"cursor": encode(position)})
+            self.assertEqual(response.status_code, 404, position)
+        response = client.get(reverse("pft:transaction-list"), {"cursor": encode(["2025-01-01", 1])})
+        self.assertEqual(response.status_code, 200)
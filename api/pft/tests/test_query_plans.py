@@ -0,0 +1,126 @@
+import datetime
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+
+from pft.management.commands.audit_query_plans import audit_plans
+from pft.models import (
+    AnalyticsReport,
+    BillReminder,
+    Budget,
+    Category,
+    DebtAccount,
+    Investment,
+    ReportJob,
+    SavingsGoal,
+    Subscription,
+    SubscriptionPlan,
+    Transaction,
+    TransactionRollup,
+    User,
+)
+
+USERS = 20
+# Rows per model of the audited user, a heavy one, and of everyone else
+HEAVY_ROWS = 1000
+ROWS = 50
+
+
+class QueryPlanTests(TestCase):
+    """Every audited query is served by the index it was designed for."""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = datetime.date.today()
+        plan = SubscriptionPlan.objects.create(name="Streaming", type="ott")
+        users = [
+            User.objects.create_user(email=f"plans{i}@example.com", username=f"plans{i}")
+            for i in range(USERS)
+        ]
+        cls.user = users[0]
+
+        for user in users:
+            rows = HEAVY_ROWS if user == cls.user else ROWS
+            category = Category.objects.get(user=user, name="Groceries")
+            Category.objects.bulk_create(
+                Category(user=user, name=f"Category {i}", type="expense") for i in range(rows)
+            )
+            days = [today - datetime.timedelta(days=i) for i in range(rows * 10)]
+            Transaction.objects.bulk_create(
+                Transaction(
+                    user=user,
+                    title="Coffee" if i % 500 == 0 else f"Purchase {i}",
+                    amount=Decimal("9.99"),
+                    type="expense",
+                    category=category,
+                    transaction_date=day
+                )
+                for i, day in enumerate(days)
+            )
+            Budget.objects.bulk_create(
+                Budget(
+                    user=user, category=category, amount_limit=100,
+                    year=1900 + i // 12, month=i % 12 + 1
+                )
+                for i in range(rows)
+            )
+            Subscription.objects.bulk_create(
+                Subscription(
+                    user=user, plan=plan, amount=10, start_date=today,
+                    next_billing_date=today + datetime.timedelta(days=i),
+                    status="active" if i % 5 == 0 else "cancelled"
+                )
+                for i in range(rows)
+            )
+            reports = AnalyticsReport.objects.bulk_create(
+                AnalyticsReport(
+                    user=user, report_type="monthly", start_date=today,
+                    end_date=today, data={}
+                )
+                for _ in range(rows)
+            )
+            ReportJob.objects.bulk_create(
+                ReportJob(
+                    user=user, report_type="monthly", start_date=today,
+                    end_date=today, status="completed", report=report
+                )
+                for report in reports
+            )
+            SavingsGoal.objects.bulk_create(
+                SavingsGoal(user=user, title=f"Goal {i}", target_amount=100, target_date=today)
+                for i in range(rows)
+            )
+            BillReminder.objects.bulk_create(
+                BillReminder(
+                    user=user, title=f"Bill {i}", amount=10,
+                    due_date=today + datetime.timedelta(days=i - rows // 2),
+                    status="pending" if i % 5 == 0 else "paid"
+                )
+                for i in range(rows)
+            )
+            DebtAccount.objects.bulk_create(
+                DebtAccount(
+                    user=user, name=f"Loan {i}", balance=1000, interest_rate=5,
+                    minimum_payment=50, due_date=today + datetime.timedelta(days=i),
+                    account_type="loan"
+                )
+                for i in range(rows)
+            )
+            Investment.objects.bulk_create(
+                Investment(
+                    user=user, name=f"Fund {i}", type="stocks", purchase_price=10,
+                    quantity=1, purchase_date=today
+                )
+                for i in range(rows)
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_queries_use_their_index(self):
+        # Built by Transaction.objects.bulk_create() above
+        self.assertTrue(TransactionRollup.objects.filter(user=self.user).exists())
+        for name, plan, problem in audit_plans(self.user):
+            with self.subTest(name):
+                self.assertIsNone(problem, plan)
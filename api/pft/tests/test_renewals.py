@@ -0,0 +1,44 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+
+from pft.models import Subscription, SubscriptionPlan, Transaction, User
+from pft.renewals import renew_chunk
+
+
+class RenewSubscriptionsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="renewals@example.com", username="renewals")
+        self.subscription = Subscription.objects.create(
+            user=self.user,
+            plan=SubscriptionPlan.objects.create(name="Netflix", billing_cycle="monthly"),
+            amount=Decimal("15.49"),
+            start_date=datetime.date(2024, 1, 10),
+            next_billing_date=datetime.date(2024, 2, 10),
+        )
+        self.today = datetime.date(2025, 6, 15)
+
+    def renew(self, **kwargs):
+        while renew_chunk(today=self.today, **kwargs):
+            pass
+        self.subscription.refresh_from_db()
+        return list(
+            Transaction.objects.filter(subscription=self.subscription)
+            .order_by("transaction_date").values_list("transaction_date", flat=True)
+        )
+
+    def test_only_the_current_period_is_charged(self):
+        self.assertEqual(self.renew(), [datetime.date(2025, 6, 10)])
+        self.assertEqual(self.subscription.next_billing_date, datetime.date(2025, 7, 10))
+
+    def test_backfill_charges_every_missed_period(self):
+        dates = self.renew(backfill=True)
+        self.assertEqual(len(dates), 17)
+        self.assertEqual((dates[0], dates[-1]), (datetime.date(2024, 2, 10), datetime.date(2025, 6, 10)))
+        self.assertEqual(self.subscription.next_billing_date, datetime.date(2025, 7, 10))
+
+    def test_subscription_ended_before_the_current_period_is_not_charged(self):
+        Subscription.objects.filter(pk=self.subscription.pk).update(end_date=datetime.date(2024, 12, 31))
+        self.assertEqual(self.renew(), [])
+        self.assertEqual(self.subscription.status, "expired")
@@ -0,0 +1,34 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from pft.models import Subscription, SubscriptionPlan, Transaction, User
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="search@example.com", username="search")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_lists_match_parts_of_words(self):
+        for name in ("Netflix", "Spotify"):
+            Subscription.objects.create(
+                user=self.user, plan=SubscriptionPlan.objects.create(name=name),
+                amount=Decimal("9.99"), start_date=datetime.date(2025, 1, 1)
+            )
+        response = self.client.get(reverse("pft:subscription-list"), {"search": "net"})
+        self.assertEqual([row["plan_details"]["name"] for row in response.data], ["Netflix"])
+
+    def test_transactions_match_whole_words_ranked(self):
+        for title in ("Coffee beans", "Corner coffee shop", "Rent"):
+            Transaction.objects.create(
+                user=self.user, title=title, amount=Decimal("5.00"), type="expense",
+                transaction_date=datetime.date(2025, 3, 1)
+            )
+        response = self.client.get(reverse("pft:transaction-list"), {"search": "coffee"})
+        titles = [row["title"] for row in response.data["results"]]
+        self.assertEqual(sorted(titles), ["Coffee beans", "Corner coffee shop"])
@@ -0,0 +1,69 @@
+import datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from pft.models import Subscription, SubscriptionPlan, User
+
+
+class SubscriptionQueryCountTests(TestCase):
+    """The subscription endpoints cost the same number of queries for 2 or 22 subscriptions."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="subs@example.com", username="subs")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.plans = [
+            SubscriptionPlan.objects.create(name=name, type=type)
+            for name, type in (("Netflix", "ott"), ("Figma", "tool"), ("Kindle", "product"))
+        ]
+        self.added = 0
+
+    def add_subscriptions(self, count):
+        today = timezone.now().date()
+        for i in range(self.added, self.added + count):
+            Subscription.objects.create(
+                user=self.user,
+                plan=self.plans[i % len(self.plans)],
+                amount=Decimal("9.99"),
+                start_date=today - datetime.timedelta(days=30),
+                next_billing_date=today + datetime.timedelta(days=i % 20),
+            )
+        self.added += count
+
+    def get(self, name):
+        # Measure the view itself, not a cached response
+        cache.clear()
+        response = self.client.get(reverse(f"pft:subscription-{name}"))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assert_constant_queries(self, name):
+        self.add_subscriptions(2)
+        with CaptureQueriesContext(connection) as queries:
+            self.get(name)
+
+        self.add_subscriptions(20)
+        with self.assertNumQueries(len(queries)):
+            return self.get(name)
+
+    def test_list(self):
+        response = self.assert_constant_queries("list")
+        self.assertEqual(len(response.data), 22)
+        self.assertEqual(response.data[0]["user_email"], "subs@example.com")
+        self.assertIn(response.data[0]["plan_details"]["name"], ("Netflix", "Figma", "Kindle"))
+
+    def test_upcoming_renewals(self):
+        response = self.assert_constant_queries("upcoming-renewals")
+        self.assertEqual(len(response.data), 22)
+
+    def test_statistics(self):
+        response = self.assert_constant_queries("statistics")
+        self.assertEqual(response.data["total_active_subscriptions"], 22)
+        self.assertEqual(response.data["by_type"]["ott"]["count"], 8)
@@ -0,0 +1,85 @@
+import datetime
+import math
+
+from django.db.models import F, Func, IntegerField, Value
+
+from .models import InvestmentValue
+
+DEFAULT_POINTS = 100
+MAX_POINTS = 1000
+
+
+class DaysBetween(Func):
+    """Whole days from the second date to the first (date - date is an integer in Postgres)."""
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = IntegerField()
+
+
+class Buckets:
+    """
+    Splits [start, end] into at most ``points`` buckets of ``step`` whole days.
+    Bucket 0 starts on ``start``; the last one is cut short at ``end``.
+    """
+
+    def __init__(self, start, end, points):
+        self.start = start
+        self.end = end
+        self.step = max(1, math.ceil(((end - start).days + 1) / points))
+        self.count = (end - start).days // self.step + 1
+
+    def expression(self, field='date'):
+        """SQL expression giving the bucket index of ``field``."""
+        return DaysBetween(F(field), Value(self.start)) / Value(self.step)
+
+    def end_of(self, bucket):
+        return min(self.start + datetime.timedelta(days=(bucket + 1) * self.step - 1), self.end)
+
+
+def holding_series(investment, buckets):
+    """Last recorded value of one holding in every bucket that has one."""
+    return list(
+        investment.values
+        .filter(date__range=(buckets.start, buckets.end))
+        .annotate(bucket=buckets.expression())
+        .order_by('bucket', '-date', '-id')
+        .distinct('bucket')
+        .values('bucket', 'date', 'value')
+    )
+
+
+def portfolio_series(investments, buckets):
+    """
+    Total value of ``investments`` at the end of every bucket. Each holding
+    counts at its latest value so far (carried forward over buckets without a
+    new value) and not at all before its first recorded value.
+    """
+    values = InvestmentValue.objects.filter(investment__in=investments)
+
+    # Value every holding already had when the range starts
+    latest = dict(
+        values.filter(date__lt=buckets.start)
+        .order_by('investment_id', '-date', '-id')
+        .distinct('investment_id')
+        .values_list('investment_id', 'value')
+    )
+
+    # Last value of every holding in every bucket, in bucket order
+    rows = (
+        values.filter(date__range=(buckets.start, buckets.end))
+        .annotate(bucket=buckets.expression())
+        .order_by('bucket', 'investment_id', '-date', '-id')
+        .distinct('bucket', 'investment_id')
+        .values_list('bucket', 'investment_id', 'value')
+        .iterator()
+    )
+
+    points = []
+    row = next(rows, None)
+    for bucket in range(buckets.count):
+        while row is not None and row[0] == bucket:
+            latest[row[1]] = row[2]
+            row = next(rows, None)
+        if latest:
+            points.append({'date': buckets.end_of(bucket), 'value': sum(latest.values())})
+    return points
@@ -1,10 +1,13 @@
 from django.urls import path, include
+from . import async_views
 from .routers import router
 from .views import (
     RegisterUserAPIView, 
     MeView,
     UpdateProfileView,
     ChangePasswordView,
+    CacheStatsView,
+    DatabasePoolStatsView,
 )
 
 app_name = "pft"
@@ -15,4 +18,10 @@ urlpatterns = [
     path("me/", MeView.as_view(), name="me"),
     path("profile/update/", UpdateProfileView.as_view(), name="update-profile"),
     path("profile/change-password/", ChangePasswordView.as_view(), name="change-password"),
+    path("cache/stats/", CacheStatsView.as_view(), name="cache-stats"),
+    path("db/pool/stats/", DatabasePoolStatsView.as_view(), name="db-pool-stats"),
+    path("dashboard/", async_views.dashboard, name="dashboard"),
+    path("dashboard/portfolio-summary/", async_views.portfolio_summary, name="dashboard-portfolio-summary"),
+    path("dashboard/subscription-statistics/", async_views.subscription_statistics, name="dashboard-subscription-statistics"),
+    path("dashboard/monthly-summary/", async_views.monthly_summary, name="dashboard-monthly-summary"),
 ]
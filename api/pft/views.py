@@ -1,46 +1,72 @@
 from rest_framework import generics, permissions, viewsets, status, filters
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.reverse import reverse
 from .models import (
     Budget, Category, Transaction, SubscriptionPlan, Subscription,
     AnalyticsReport, SavingsGoal, BillReminder, DebtAccount, DebtPayment,
-    Investment, InvestmentValue
+    Investment, InvestmentValue, ReportJob, TransactionRollup, User
 )
+from django.conf import settings
 from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.core.exceptions import ValidationError
-from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from .exporters import (
+    EXPORT_FIELDS, FORMATS as EXPORT_FORMATS, aiterator as export_aiterator,
+    astream as export_astream, stream as export_stream
+)
+from .importers import PARSERS as IMPORT_PARSERS, ImportFormatError, build_transaction, load_category_map
+from . import aggregates, reports
+from .authentication import ClaimsTokenObtainPairSerializer
+from .cache import cached_response, get_stats as get_cache_stats
+from .conditional import ConditionalListMixin
+from .pagination import CustomPagination
+from .postgresql.base import get_pool_stats
+from .search import FullTextSearchFilter
+from .timeseries import Buckets, holding_series, portfolio_series
 from .serializers import (
     BudgetSerializer,
+    BudgetUtilizationQuerySerializer,
     CategorySerializer,
     TransactionSerializer,
+    TransactionBatchSerializer,
+    TransactionBatchDeleteSerializer,
     UserRegistrationSerializer,
     UserProfileSerializer,
     SubscriptionPlanSerializer,
     SubscriptionSerializer,
     AnalyticsReportSerializer,
+    ReportJobSerializer,
     SavingsGoalSerializer,
     BillReminderSerializer,
     DebtAccountSerializer,
+    DebtPaymentSerializer,
     InvestmentSerializer,
+    InvestmentHistoryQuerySerializer,
+    InvestmentValueSerializer,
+    TimeSeriesPointSerializer,
 )
+import csv
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from datetime import timedelta
 from decimal import Decimal
 
 
-class CustomPagination(PageNumberPagination):
-    page_size = 100
-
-
 # CATEGORY VIEWSET
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('name', 'id')
 
     def get_queryset(self):
         return Category.objects.filter(
@@ -52,11 +78,16 @@ class CategoryViewSet(viewsets.ModelViewSet):
 
 
 # TRANSACTION VIEWSET
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = CustomPagination
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cursor_ordering = ('-transaction_date', '-id')
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
+    search_fields = ['title']
+    trigram_fields = ['title']
+    # Deleting a category sets it to NULL without saving the transactions
+    counted_fields = ('category',)
 
     def get_queryset(self):
         queryset = Transaction.objects.filter(user=self.request.user)
@@ -75,33 +106,191 @@ class TransactionViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_file(self, request):
+        """Import transactions from an uploaded CSV or OFX bank export"""
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {'error': 'A CSV or OFX file is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        file_type = (request.data.get('file_type') or upload.name.rsplit('.', 1)[-1]).lower()
+        parse = IMPORT_PARSERS.get(file_type)
+        if parse is None:
+            return Response(
+                {'error': f"Unsupported file type, expected one of: {', '.join(IMPORT_PARSERS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        categories = load_category_map(request.user)
+        batch_size = settings.PFT_IMPORT_BATCH_SIZE
+        imported = 0
+        errors = []
+        buckets = set()
+        batch = []
+
+        def flush():
+            if not batch:
+                return
+            Transaction.objects.bulk_create(batch, refresh_rollups=False)
+            buckets.update(obj.rollup_bucket for obj in batch)
+            batch.clear()
+
+        try:
+            with transaction.atomic():
+                for row_number, row in enumerate(parse(upload), start=1):
+                    try:
+                        batch.append(build_transaction(row, request.user, categories))
+                    except ValueError as e:
+                        errors.append({'row': row_number, 'errors': e.args[0]})
+                        continue
+                    imported += 1
+                    if len(batch) >= batch_size:
+                        flush()
+                flush()
+                TransactionRollup.objects.refresh(buckets)
+        except (ImportFormatError, UnicodeDecodeError, csv.Error) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'imported': imported,
+            'failed': len(errors),
+            'errors': errors,
+        }, status=status.HTTP_201_CREATED if imported else status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'])
+    def batch(self, request):
+        """Create, partially update or delete a list of transactions at once"""
+        if request.method == 'POST':
+            return self._batch_create(request)
+        if request.method == 'PATCH':
+            return self._batch_update(request)
+        return self._batch_delete(request)
+
+    def _batch_serializer(self, *args, **kwargs):
+        return TransactionBatchSerializer(
+            *args,
+            many=True,
+            max_length=settings.PFT_BATCH_MAX_SIZE,
+            context=self.get_serializer_context(),
+            **kwargs
+        )
+
+    def _batch_create(self, request):
+        serializer = self._batch_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save(user=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def _batch_update(self, request):
+        if not isinstance(request.data, list):
+            return Response(
+                {'error': 'Expected a list of transactions'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        ids = [item.get('id') if isinstance(item, dict) else None for item in request.data]
+        instances = self.get_queryset().in_bulk(
+            [pk for pk in ids if isinstance(pk, int) and not isinstance(pk, bool)]
+        )
+        errors = [{} if pk in instances else {'id': ['Not found.']} for pk in ids]
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self._batch_serializer(
+            [instances[pk] for pk in ids], data=request.data, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        return Response(serializer.data)
+
+    def _batch_delete(self, request):
+        serializer = TransactionBatchDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(id__in=ids)
+            existing = set(queryset.values_list('id', flat=True))
+            queryset.delete()
+
+        return Response({
+            'deleted': len(existing),
+            'results': [
+                {'id': pk, 'status': 'deleted' if pk in existing else 'not_found'}
+                for pk in ids
+            ],
+        })
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream the filtered ledger as CSV or NDJSON"""
+        file_type = request.query_params.get('file_type', 'csv').lower()
+        if file_type not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"Unsupported file type, expected one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if not queryset.ordered:
+            queryset = queryset.order_by(*self.cursor_ordering)
+        # iterator() reads through a server-side cursor, so memory stays flat
+        # however large the ledger is. Under ASGI, Django reads a sync
+        # iterator whole before sending the first byte: hand it an async one.
+        rows = queryset.values_list(*EXPORT_FIELDS)
+        chunk_size = settings.PFT_EXPORT_CHUNK_SIZE
+        if isinstance(request._request, ASGIRequest):
+            body = export_astream(file_type, export_aiterator(rows, chunk_size))
+        else:
+            body = export_stream(file_type, rows.iterator(chunk_size=chunk_size))
+
+        content_type = EXPORT_FORMATS[file_type][0]
+        response = StreamingHttpResponse(body, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="transactions.{file_type}"'
+        return response
+
 
 # BUDGET VIEWSET
-class BudgetViewSet(viewsets.ModelViewSet):
+class BudgetViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = BudgetSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('-year', '-month', 'id')
 
     def get_queryset(self):
         return Budget.objects.filter(user=self.request.user)
 
-    def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
-        
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        
-        # If an existing budget was found in validation, update it
-        if serializer.instance:
-            serializer.update(serializer.instance, serializer.validated_data)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        
-        # Otherwise create a new budget
         self.perform_create(serializer)
+        if not serializer.created:
+            # Replaced the limit of the existing budget of that category and month
+            return Response(serializer.data)
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['get'])
+    @cached_response
+    def utilization(self, request):
+        """
+        Spent, remaining and percentage used of each budget of ?year=&month=
+        (the whole year without month, the current month by default).
+        """
+        query = BudgetUtilizationQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        return Response(aggregates.budget_utilization(
+            request.user, query.validated_data['year'], query.validated_data.get('month')
+        ))
+
 
 class RegisterUserAPIView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
@@ -127,17 +316,6 @@ class RegisterUserAPIView(generics.CreateAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Check if email already exists
-        if get_user_model().objects.filter(email=email).exists():
-            return Response(
-                {
-                    "email": [
-                        "Something went wrong. Please contact support or try again."
-                    ]
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
         # Set username to email before passing to serializer
         mutable_data = request.data.copy()
         mutable_data['username'] = email
@@ -159,14 +337,16 @@ class UpdateProfileView(generics.UpdateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # request.user is built from the token claims and cannot be saved
+        return User.objects.get(pk=self.request.user.pk)
 
 
 class ChangePasswordView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        user = request.user
+        # request.user is built from the token claims and cannot be saved
+        user = User.objects.get(pk=request.user.pk)
         current_password = request.data.get("current_password")
         new_password = request.data.get("new_password")
         confirm_password = request.data.get("confirm_password")
@@ -194,14 +374,39 @@ class ChangePasswordView(APIView):
         except ValidationError as e:
             return Response({"error": list(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Saving the new password revokes every token of the user, this
+        # request's included: hand back a fresh pair
         user.set_password(new_password)
         user.save()
+        refresh = ClaimsTokenObtainPairSerializer.get_token(user)
         return Response(
-            {"message": "Password updated successfully"}, status=status.HTTP_200_OK
+            {
+                "message": "Password updated successfully",
+                "refresh": str(refresh),
+                "access": str(refresh.access_token),
+            },
+            status=status.HTTP_200_OK
         )
 
 
-class SubscriptionPlanViewSet(viewsets.ModelViewSet):
+class CacheStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        """Hit and miss counters of the read endpoint response cache"""
+        return Response(get_cache_stats())
+
+
+class DatabasePoolStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        """Usage and checkout wait times of this process' database connection pool"""
+        return Response(get_pool_stats())
+
+
+
+class SubscriptionPlanViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     queryset = SubscriptionPlan.objects.all()
     serializer_class = SubscriptionPlanSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -210,20 +415,24 @@ class SubscriptionPlanViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'type', 'created_at']
 
 
-class SubscriptionViewSet(viewsets.ModelViewSet):
+class SubscriptionViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = SubscriptionSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['plan__name', 'status', 'notes']
     ordering_fields = ['start_date', 'end_date', 'amount', 'created_at']
 
+    last_modified_fields = ('updated_at', 'plan__updated_at')
+
     def get_queryset(self):
-        return Subscription.objects.filter(user=self.request.user)
+        # SubscriptionSerializer nests plan_details and user.email
+        return Subscription.objects.filter(user=self.request.user).select_related('plan', 'user')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
     @action(detail=False, methods=['get'])
+    @cached_response
     def upcoming_renewals(self, request):
         """Get subscriptions that are due for renewal in the next 30 days"""
         thirty_days_from_now = timezone.now().date() + timedelta(days=30)
@@ -235,33 +444,17 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
+    @cached_response
     def statistics(self, request):
         """Get subscription statistics"""
-        queryset = self.get_queryset()
-        total_active = queryset.filter(status='active').count()
-        total_amount = sum(sub.amount for sub in queryset.filter(status='active'))
-        by_type = {}
-        for sub in queryset.filter(status='active'):
-            plan_type = sub.plan.type
-            if plan_type not in by_type:
-                by_type[plan_type] = {
-                    'count': 0,
-                    'total_amount': 0
-                }
-            by_type[plan_type]['count'] += 1
-            by_type[plan_type]['total_amount'] += float(sub.amount)
-
-        return Response({
-            'total_active_subscriptions': total_active,
-            'total_monthly_amount': total_amount,
-            'by_type': by_type
-        })
+        return Response(aggregates.subscription_statistics(request.user))
 
 
-class AnalyticsReportViewSet(viewsets.ModelViewSet):
+class AnalyticsReportViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = AnalyticsReportSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         return AnalyticsReport.objects.filter(user=self.request.user)
@@ -271,47 +464,47 @@ class AnalyticsReportViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def monthly_summary(self, request):
+        """
+        The current month's summary. Answers with the stored report while the
+        month's transactions are unchanged; otherwise queues its generation
+        and answers 202 with the job to poll at report-jobs/{id}/, which
+        carries the report once it is done.
+        """
         today = timezone.now().date()
         start_date = today.replace(day=1)
         end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
-        report = AnalyticsReport.objects.create(
-            user=request.user,
-            start_date=start_date,
-            end_date=end_date,
-            report_type='monthly',
-            data=self._generate_monthly_summary(start_date, end_date)
-        )
-        serializer = self.get_serializer(report)
-        return Response(serializer.data)
 
-    def _generate_monthly_summary(self, start_date, end_date):
-        transactions = Transaction.objects.filter(
-            user=self.request.user,
-            transaction_date__range=[start_date, end_date]
+        report = reports.find_report(request.user, 'monthly', start_date, end_date)
+        if report is not None:
+            return Response(self.get_serializer(report).data)
+
+        job = reports.enqueue_report(request.user, 'monthly', start_date, end_date)
+        serializer = ReportJobSerializer(job, context=self.get_serializer_context())
+        return Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': reverse('pft:report-job-detail', args=[job.pk], request=request)}
         )
-        
-        summary = {
-            'total_income': str(sum(t.amount for t in transactions if t.type == 'income')),
-            'total_expenses': str(sum(t.amount for t in transactions if t.type == 'expense')),
-            'by_category': {}
-        }
-        
-        for transaction in transactions:
-            category_name = transaction.category.name if transaction.category else 'Uncategorized'
-            if category_name not in summary['by_category']:
-                summary['by_category'][category_name] = {'income': '0', 'expense': '0'}
-            summary['by_category'][category_name][transaction.type] = str(
-                Decimal(summary['by_category'][category_name][transaction.type]) + transaction.amount
-            )
-        
-        return summary
 
 
-class SavingsGoalViewSet(viewsets.ModelViewSet):
+class ReportJobViewSet(ConditionalListMixin, viewsets.ReadOnlyModelViewSet):
+    serializer_class = ReportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CustomPagination
+    cursor_ordering = ('-created_at', '-id')
+    # ReportJobSerializer nests the report, which deleting it sets to NULL
+    last_modified_fields = ('updated_at', 'report__updated_at')
+    counted_fields = ('report',)
+
+    def get_queryset(self):
+        return ReportJob.objects.filter(user=self.request.user).select_related('report__user')
+
+
+class SavingsGoalViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = SavingsGoalSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('-created_at', '-id')
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'status']
     ordering_fields = ['target_date', 'created_at', 'current_amount', 'target_amount']
@@ -342,10 +535,11 @@ class SavingsGoalViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class BillReminderViewSet(viewsets.ModelViewSet):
+class BillReminderViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = BillReminderSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('due_date', 'id')
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'status']
     ordering_fields = ['due_date', 'created_at', 'amount']
@@ -357,6 +551,7 @@ class BillReminderViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
     @action(detail=False, methods=['get'])
+    @cached_response
     def upcoming(self, request):
         today = timezone.now().date()
         next_week = today + timedelta(days=7)
@@ -386,19 +581,51 @@ class BillReminderViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class DebtAccountViewSet(viewsets.ModelViewSet):
+class DebtAccountViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = DebtAccountSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('due_date', 'id')
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'account_type', 'status']
     ordering_fields = ['due_date', 'balance', 'created_at']
 
     def get_queryset(self):
-        return DebtAccount.objects.filter(user=self.request.user)
+        return DebtAccount.objects.filter(user=self.request.user).select_related('user').annotate(
+            payments_count=Count('payments'),
+            total_paid=Coalesce(Sum('payments__amount'), Value(Decimal('0'))),
+            last_payment_date=Max('payments__payment_date'),
+            payments_updated_at=Max('payments__updated_at')
+        ).order_by('due_date', 'id')  # Meta.ordering is dropped from GROUP BY queries
+
+    def get_list_validator(self, queryset):
+        # Deleting a payment changes the aggregates without touching a timestamp
+        return queryset.aggregate(
+            last_modified=Greatest(Max('updated_at'), Max('payments_updated_at')),
+            count=Count('pk'),
+            payments=Sum('payments_count')
+        )
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+        self._reload_aggregates(serializer)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        self._reload_aggregates(serializer)
+
+    def _reload_aggregates(self, serializer):
+        # The saved instance has no payment aggregates to serialize
+        serializer.instance = self.get_queryset().get(pk=serializer.instance.pk)
+
+    @action(detail=True, methods=['get'], cursor_ordering=('-payment_date', '-id'))
+    def payments(self, request, pk=None):
+        """Paginated payment history of one debt account, newest first"""
+        debt_account = self.get_object()
+        payments = debt_account.payments.select_related('transaction').order_by('-payment_date', '-id')
+        page = self.paginate_queryset(payments)
+        serializer = DebtPaymentSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def record_payment(self, request, pk=None):
@@ -438,65 +665,110 @@ class DebtAccountViewSet(viewsets.ModelViewSet):
             debt_account.status = 'paid_off'
         debt_account.save()
         
-        serializer = self.get_serializer(debt_account)
+        serializer = self.get_serializer(self.get_queryset().get(pk=debt_account.pk))
         return Response(serializer.data)
 
 
-class InvestmentViewSet(viewsets.ModelViewSet):
+class InvestmentViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = InvestmentSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('-created_at', '-id')
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'symbol', 'type']
     ordering_fields = ['purchase_date', 'created_at', 'purchase_price']
 
     def get_queryset(self):
-        return Investment.objects.filter(user=self.request.user)
+        return Investment.objects.filter(user=self.request.user).select_related('user')
 
     def perform_create(self, serializer):
-        investment = serializer.save(user=self.request.user)
+        purchase_date = serializer.validated_data['purchase_date']
+        initial_value = serializer.validated_data['purchase_price'] * serializer.validated_data['quantity']
+        investment = serializer.save(
+            user=self.request.user,
+            current_value=initial_value,
+            current_value_date=purchase_date
+        )
         
         # Record initial value
         InvestmentValue.objects.create(
             investment=investment,
-            date=investment.purchase_date,
-            value=investment.purchase_price * investment.quantity
+            date=purchase_date,
+            value=initial_value
         )
 
     @action(detail=True, methods=['post'])
     def update_value(self, request, pk=None):
         investment = self.get_object()
         value = Decimal(request.data.get('value', 0))
-        date = request.data.get('date', timezone.now().date())
+        date = request.data.get('date') or timezone.now().date()
+        try:
+            date = parse_date(date) if isinstance(date, str) else date
+        except ValueError:
+            date = None
         
         if value < 0:
             return Response(
                 {'error': 'Value cannot be negative'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        if date is None:
+            return Response(
+                {'error': 'Date must be in YYYY-MM-DD format'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Record new value
-        InvestmentValue.objects.create(
-            investment=investment,
-            date=date,
-            value=value
-        )
+        investment.record_value(date, value)
         
         serializer = self.get_serializer(investment)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'], cursor_ordering=('-date', '-id'))
+    def values(self, request, pk=None):
+        """Paginated value history of one investment, newest first"""
+        investment = self.get_object()
+        page = self.paginate_queryset(investment.values.order_by('-date', '-id'))
+        serializer = InvestmentValueSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """
+        Value history of one investment downsampled to at most ``points``
+        points: the last recorded value in each equal-width date bucket.
+        """
+        investment = self.get_object()
+        buckets = self._history_buckets(request, investment.purchase_date)
+        return self._history_response(buckets, holding_series(investment, buckets))
+
     @action(detail=False, methods=['get'])
-    def portfolio_summary(self, request):
+    def portfolio_history(self, request):
+        """
+        Total portfolio value at the end of each date bucket, carrying every
+        holding's latest value forward until it changes.
+        """
         investments = self.get_queryset()
-        total_invested = sum(i.purchase_price * i.quantity for i in investments)
-        current_value = sum(
-            i.values.first().value if i.values.exists() else i.purchase_price * i.quantity
-            for i in investments
-        )
-        
+        first_purchase = investments.aggregate(first=Min('purchase_date'))['first']
+        buckets = self._history_buckets(request, first_purchase or timezone.now().date())
+        return self._history_response(buckets, portfolio_series(investments, buckets))
+
+    def _history_buckets(self, request, default_start):
+        query = InvestmentHistoryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        end = query.validated_data['end']
+        start = query.validated_data.get('start') or min(default_start, end)
+        return Buckets(start, end, query.validated_data['points'])
+
+    def _history_response(self, buckets, points):
         return Response({
-            'total_invested': str(total_invested),
-            'current_value': str(current_value),
-            'total_gain_loss': str(current_value - total_invested),
-            'gain_loss_percentage': str((current_value - total_invested) / total_invested * 100 if total_invested > 0 else 0)
+            'start': buckets.start,
+            'end': buckets.end,
+            'step_days': buckets.step,
+            'points': TimeSeriesPointSerializer(points, many=True).data
         })
+
+    @action(detail=False, methods=['get'])
+    @cached_response
+    def portfolio_summary(self, request):
+        return Response(aggregates.portfolio_summary(request.user))